@@ -3,7 +3,9 @@ Configuration des sites de streaming supportés
 Multi-langues: EN, FR, ES, IT, DE, JP
 """
 
-from typing import Dict, List, Any
+import re
+from typing import Dict, List, Any, Mapping
+from types import MappingProxyType
 from dataclasses import dataclass
 from enum import Enum
 
@@ -22,6 +24,15 @@ class Language(Enum):
     JP = "japanese"
     MULTI = "multi"
 
+_DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+})
+
 @dataclass
 class SiteConfig:
     name: str
@@ -34,18 +45,12 @@ class SiteConfig:
     api_based: bool = False
     search_endpoint: str = ""
     details_endpoint: str = ""
-    headers: Dict[str, str] = None
+    headers: Mapping[str, str] = None
     
     def __post_init__(self):
         if self.headers is None:
-            self.headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-            }
+            # Partagé par toutes les configs: faire dict(config.headers) avant de modifier
+            self.headers = _DEFAULT_HEADERS
 
 # Configuration des sites supportés
 SITES_CONFIG: Dict[str, SiteConfig] = {
@@ -199,39 +204,39 @@ DEFAULT_SITES = {
 # Configuration des extracteurs vidéo
 VIDEO_EXTRACTORS = {
     "streamtape": {
-        "pattern": r"streamtape\.com/e/(\w+)",
+        "pattern": re.compile(r"streamtape\.com/e/(\w+)"),
         "extractor": "StreamtapeExtractor",
     },
     "doodstream": {
-        "pattern": r"dood\.[^/]+/e/(\w+)",
+        "pattern": re.compile(r"dood\.[^/]+/e/(\w+)"),
         "extractor": "DoodStreamExtractor",
     },
     "mixdrop": {
-        "pattern": r"mixdrop\.[^/]+/e/(\w+)",
+        "pattern": re.compile(r"mixdrop\.[^/]+/e/(\w+)"),
         "extractor": "MixDropExtractor",
     },
     "upstream": {
-        "pattern": r"upstream\.to/e/(\w+)",
+        "pattern": re.compile(r"upstream\.to/e/(\w+)"),
         "extractor": "UpstreamExtractor",
     },
     "vidcloud": {
-        "pattern": r"vidcloud\.[^/]+/e/(\w+)",
+        "pattern": re.compile(r"vidcloud\.[^/]+/e/(\w+)"),
         "extractor": "VidCloudExtractor",
     },
     "mp4upload": {
-        "pattern": r"mp4upload\.com/embed-(\w+)",
+        "pattern": re.compile(r"mp4upload\.com/embed-(\w+)"),
         "extractor": "Mp4UploadExtractor",
     },
     "yourupload": {
-        "pattern": r"yourupload\.com/embed/(\w+)",
+        "pattern": re.compile(r"yourupload\.com/embed/(\w+)"),
         "extractor": "YourUploadExtractor",
     },
     "sbembed": {
-        "pattern": r"sbembed\.com/embed/(\w+)",
+        "pattern": re.compile(r"sbembed\.com/embed/(\w+)"),
         "extractor": "SbEmbedExtractor",
     },
     "filemoon": {
-        "pattern": r"filemoon\.sx/e/(\w+)",
+        "pattern": re.compile(r"filemoon\.sx/e/(\w+)"),
         "extractor": "FileMoonExtractor",
     },
 }
@@ -245,10 +250,24 @@ REDIS_CONFIG = {
     "ttl": 3600,  # 1 heure
 }
 
+# Cache mémoire des recherches (coalescence + TTL)
+SEARCH_CACHE = {
+    "maxsize": 512,
+    "ttl": REDIS_CONFIG["ttl"],
+}
+
+# Cache mémoire des réponses sérialisées de /api/details. TTL court: les
+# détails d'un film embarquent ses liens de streaming, qui expirent
+RESPONSE_CACHE = {
+    "maxsize": 1000,
+    "ttl": 300,
+}
+
 # Rate limiting
 RATE_LIMIT = {
     "requests_per_minute": 60,
     "requests_per_hour": 1000,
+    "concurrent_per_source": 4,
 }
 
 # Timeouts
@@ -256,3 +275,13 @@ TIMEOUTS = {
     "connection": 10,
     "read": 30,
 }
+
+# Pool de connexions HTTP partagé par les scrapers
+HTTP_POOL = {
+    "max_connections": 200,
+    "max_connections_per_host": 64,
+    "keepalive_timeout": 30,
+    "dns_cache_ttl": 300,
+    "read_bufsize": 256 * 1024,
+    "force_ipv4": True,
+}
@@ -4,25 +4,38 @@ API universelle pour scraper des animes, films et séries
 """
 
 import os
+import queue
+import hashlib
 import asyncio
-from typing import List, Optional, Dict, Any
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import heapq
+import bisect
+import importlib
+from functools import lru_cache
+from collections.abc import Mapping
+from typing import List, Optional, Dict, Any, Iterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+import orjson
+from cachetools import TTLCache
+
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, StreamingResponse, Response, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 import uvicorn
 
-from config import SITES_CONFIG, ContentType, Language, DEFAULT_SITES
-from scrapers import (
-    GogoanimeScraper, ZoroScraper, AnimeHeavenScraper, AnimeSamaScraper,
-    SFlixScraper, FMoviesScraper, LookMovieScraper, VidSrcScraper
-)
+from config import SITES_CONFIG, ContentType, Language, DEFAULT_SITES, SEARCH_CACHE, RESPONSE_CACHE, RATE_LIMIT, TIMEOUTS, HTTP_POOL
+from scrapers.utils import open_shared_session, close_shared_session
 
 # ==================== MODÈLES PYDANTIC ====================
 
-class SearchResult(BaseModel):
+class ResponseModel(BaseModel):
+    """Base des modèles de sortie: schéma construit à la première utilisation"""
+    model_config = ConfigDict(extra='ignore', validate_assignment=False, defer_build=True)
+
+class SearchResult(ResponseModel):
     id: str
     title: str
     url: str
@@ -31,7 +44,7 @@ class SearchResult(BaseModel):
     source: str
     year: str = ""
 
-class VideoSourceResponse(BaseModel):
+class VideoSourceResponse(ResponseModel):
     url: str
     type: str
     quality: str = "unknown"
@@ -40,7 +53,7 @@ class VideoSourceResponse(BaseModel):
     referer: str = ""
     headers: Dict[str, str] = {}
 
-class EpisodeResponse(BaseModel):
+class EpisodeResponse(ResponseModel):
     number: int
     title: str
     id: str
@@ -51,14 +64,14 @@ class EpisodeResponse(BaseModel):
     sources: List[VideoSourceResponse] = []
     download_links: List[Dict[str, str]] = []
 
-class SeasonResponse(BaseModel):
+class SeasonResponse(ResponseModel):
     number: int
     title: str
     id: str
     episode_count: int
     episodes: List[EpisodeResponse] = []
 
-class ContentDetails(BaseModel):
+class ContentDetails(ResponseModel):
     title: str
     original_title: str = ""
     id: str
@@ -93,36 +106,305 @@ class SearchRequest(BaseModel):
     limit: int = Field(default=10, ge=1, le=50, description="Nombre max de résultats")
     sources: List[str] = Field(default=[], description="Sources spécifiques à utiliser")
 
-class ApiResponse(BaseModel):
+class ApiResponse(ResponseModel):
+    # Sert au schéma OpenAPI (response_model) ; les réponses elles-mêmes
+    # sont construites par api_response, sans instancier ce modèle
     success: bool
     message: str = ""
     data: Any = None
     sources_used: List[str] = []
 
+def api_response(success: bool, message: str = "", data: Any = None, sources_used: Optional[List[str]] = None) -> ORJSONResponse:
+    """Construit une réponse au format ApiResponse sans passer par la validation Pydantic"""
+    return ORJSONResponse({
+        "success": success,
+        "message": message,
+        "data": data,
+        "sources_used": sources_used or [],
+    })
+
+# ==================== LOGGING ====================
+
+logger = logging.getLogger(__name__)
+
+# Loggers de l'application, écrits depuis un thread dédié
+APP_LOGGERS = (__name__, "scrapers")
+
+# File et handler uniques pour tout le process: chaque démarrage de l'API
+# (lifespan) réutilise le même handler au lieu d'en empiler un nouveau
+_log_queue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+
+def start_logging() -> QueueListener:
+    """
+    Branche les loggers de l'application sur une file
+    
+    Les requêtes ne font qu'empiler les enregistrements ; le formatage et
+    l'écriture sur stderr se font dans le thread du QueueListener.
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    for name in APP_LOGGERS:
+        app_logger = logging.getLogger(name)
+        app_logger.addHandler(_queue_handler)
+        app_logger.setLevel(logging.INFO)
+        app_logger.propagate = False
+    listener = QueueListener(_log_queue, stream_handler)
+    listener.start()
+    return listener
+
+def stop_logging(listener: QueueListener):
+    """Vide la file, puis rend les loggers de l'application à la configuration standard"""
+    listener.stop()
+    for name in APP_LOGGERS:
+        app_logger = logging.getLogger(name)
+        app_logger.removeHandler(_queue_handler)
+        app_logger.propagate = True
+
 # ==================== INSTANCES DES SCRAPERS ====================
 
-scrapers = {
+# Module et classe de chaque scraper, importés à la première utilisation
+SCRAPER_REGISTRY: Dict[str, tuple] = {
     # Animes
-    "gogoanime": GogoanimeScraper(),
-    "zoro": ZoroScraper(),
-    "animeheaven": AnimeHeavenScraper(),
-    "animesama": AnimeSamaScraper(),
+    "gogoanime": ("scrapers.anime_scrapers", "GogoanimeScraper"),
+    "zoro": ("scrapers.anime_scrapers", "ZoroScraper"),
+    "animeheaven": ("scrapers.anime_scrapers", "AnimeHeavenScraper"),
+    "animesama": ("scrapers.anime_scrapers", "AnimeSamaScraper"),
     # Films/Séries
-    "sflix": SFlixScraper(),
-    "fmovies": FMoviesScraper(),
-    "lookmovie": LookMovieScraper(),
-    "vidsrc": VidSrcScraper(),
+    "sflix": ("scrapers.movie_scrapers", "SFlixScraper"),
+    "fmovies": ("scrapers.movie_scrapers", "FMoviesScraper"),
+    "lookmovie": ("scrapers.movie_scrapers", "LookMovieScraper"),
+    "vidsrc": ("scrapers.movie_scrapers", "VidSrcScraper"),
 }
 
+class LazyScrapers(Mapping):
+    """
+    Scrapers indexés par nom, instanciés à la première utilisation
+    
+    Les noms (in, len, itération) sont connus sans rien importer ;
+    seul l'accès à un scraper importe son module et le construit.
+    """
+    
+    def __init__(self, registry: Dict[str, tuple]):
+        self._registry = registry
+        self._instances: Dict[str, Any] = {}
+        self.session = None
+    
+    def __getitem__(self, name: str):
+        scraper = self._instances.get(name)
+        if scraper is None:
+            module_name, class_name = self._registry[name]
+            scraper = getattr(importlib.import_module(module_name), class_name)()
+            if self.session is not None:
+                scraper.session = self.session
+            self._instances[name] = scraper
+        return scraper
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry)
+    
+    def __len__(self) -> int:
+        return len(self._registry)
+    
+    def __contains__(self, name) -> bool:
+        return name in self._registry
+    
+    def set_session(self, session):
+        """Assigne la session HTTP aux scrapers existants et à venir"""
+        self.session = session
+        for scraper in self._instances.values():
+            scraper.session = session
+
+scrapers = LazyScrapers(SCRAPER_REGISTRY)
+
+# Sources utilisées par /api/search selon le type demandé
+_ANIME_SEARCH = ("gogoanime", "animeheaven", "animesama")
+_MOVIE_SEARCH = ("sflix", "lookmovie", "vidsrc")
+
+SOURCES_BY_TYPE: Dict[str, tuple] = {
+    ContentType.ANIME.value: _ANIME_SEARCH,
+    ContentType.MOVIE.value: _MOVIE_SEARCH,
+    ContentType.SERIES.value: _MOVIE_SEARCH,
+    ContentType.ALL.value: _ANIME_SEARCH + _MOVIE_SEARCH,
+}
+
+# Toutes les sources, pour /api/multi-search
+ALL_SOURCES = tuple(scrapers)
+
+# Types de contenu proposés par chaque source (/api/sources)
+SOURCE_TYPES: Dict[str, tuple] = {
+    key: ("anime",) if "anime" in key else (("movie", "series") if key in ("sflix", "fmovies", "lookmovie") else ("movie", "series", "anime"))
+    for key in SCRAPER_REGISTRY
+}
+
+@lru_cache(maxsize=None)
+def sources_meta() -> List[tuple]:
+    """(id, nom, base_url, langue, types) de chaque source, relevés une seule fois"""
+    return [
+        (key, scraper.site_name, scraper.base_url, scraper.language, SOURCE_TYPES[key])
+        for key, scraper in scrapers.items()
+    ]
+
+# Noms des sources triés, pour l'autocomplétion par préfixe
+SOURCE_NAMES = tuple(sorted(scrapers))
+
+def complete_source(prefix: str) -> List[str]:
+    """Retourne les sources dont le nom commence par le préfixe (recherche dichotomique)"""
+    prefix = prefix.lower()
+    matches = []
+    for name in SOURCE_NAMES[bisect.bisect_left(SOURCE_NAMES, prefix):]:
+        if not name.startswith(prefix):
+            break
+        matches.append(name)
+    return matches
+
+# ==================== CACHE DES RECHERCHES ====================
+
+# Recherches en cours, partagées entre les requêtes concurrentes identiques
+_inflight: Dict[tuple, asyncio.Task] = {}
+# Résultats récents, réutilisés d'une requête à l'autre
+_search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE["maxsize"], ttl=SEARCH_CACHE["ttl"])
+# Recherches simultanées par source (protège les rate limits)
+_source_sems: Dict[str, asyncio.Semaphore] = {
+    name: asyncio.Semaphore(RATE_LIMIT["concurrent_per_source"]) for name in scrapers
+}
+
+async def _limited_search(name: str, scraper, q: str, limit: int) -> List[Dict[str, Any]]:
+    """Recherche sur un scraper en respectant sa limite de concurrence"""
+    async with _source_sems[name]:
+        return await scraper.search(q, limit)
+
+def _search_done(key: tuple, task: asyncio.Task):
+    """
+    Retire la recherche terminée et met en cache son résultat s'il est non vide
+    
+    Les scrapers signalent un échec réseau ou un blocage Cloudflare par une
+    liste vide: la garder en cache figerait une panne passagère (même règle
+    que async_ttl_cache).
+    """
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled() and task.exception() is None:
+        result = task.result()
+        if result:
+            _search_cache[key] = result
+
+async def coalesced_search(name: str, scraper, q: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Recherche sur un scraper en partageant le travail réseau
+    
+    Les appels concurrents avec la même clé (source, requête, limite) attendent
+    la même tâche, et les résultats restent en cache pendant SEARCH_CACHE["ttl"].
+    Retourne des copies, les appelants annotant les résultats.
+    """
+    key = (name, q.casefold(), limit)
+    results = _search_cache.get(key)
+    if results is None:
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_limited_search(name, scraper, q, limit))
+            _inflight[key] = task
+            task.add_done_callback(lambda t: _search_done(key, t))
+        # shield: l'annulation d'un appelant n'annule pas la recherche partagée
+        results = await asyncio.shield(task)
+    return [dict(item) for item in results]
+
+async def fan_out_search(source_names, q: str, limit: int, enough: Optional[int] = None) -> List[tuple]:
+    """
+    Lance les recherches en parallèle et les collecte dans l'ordre d'arrivée
+    
+    S'arrête après TIMEOUTS["read"] secondes, ou dès que `enough` résultats
+    sont disponibles ; les recherches restantes sont annulées.
+    
+    Returns:
+        Liste de tuples (nom de la source, résultats)
+    """
+    async def search_single(name):
+        try:
+            return name, await coalesced_search(name, scrapers[name], q, limit)
+        except Exception as e:
+            logger.warning("Error with %s: %s", name, e)
+            return name, []
+    
+    tasks = [asyncio.ensure_future(search_single(name)) for name in source_names]
+    collected = []
+    found = 0
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=TIMEOUTS["read"]):
+            name, results = await next_done
+            collected.append((name, results))
+            found += len(results)
+            if enough is not None and found >= enough:
+                break
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+    return collected
+
+# ==================== CACHE DES RÉPONSES ====================
+
+def make_etag(payload: bytes) -> str:
+    """ETag fort d'un corps de réponse"""
+    return f'"{hashlib.sha1(payload).hexdigest()}"'
+
+def conditional_response(request: Request, payload: bytes, etag: str) -> Response:
+    """Réponse JSON avec ETag, ou 304 sans corps si le client a déjà cette version"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_etags or "*" in client_etags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return Response(payload, media_type="application/json", headers={"ETag": etag})
+
+# Réponses positives déjà sérialisées (corps, ETag), servies telles quelles
+_response_cache: TTLCache = TTLCache(maxsize=RESPONSE_CACHE["maxsize"], ttl=RESPONSE_CACHE["ttl"])
+
+def cached_response(request: Request, key: tuple) -> Optional[Response]:
+    """Retourne la réponse en cache pour cette clé, ou None"""
+    cached = _response_cache.get(key)
+    if cached is None:
+        return None
+    return conditional_response(request, *cached)
+
+def cache_response(request: Request, key: tuple, success: bool, message: str = "", data: Any = None, sources_used: Optional[List[str]] = None) -> Response:
+    """Sérialise une réponse au format ApiResponse, et la garde en cache si elle est positive"""
+    payload = orjson.dumps({
+        "success": success,
+        "message": message,
+        "data": data,
+        "sources_used": sources_used or [],
+    })
+    if not success:
+        return Response(payload, media_type="application/json")
+    cached = _response_cache[key] = (payload, make_etag(payload))
+    return conditional_response(request, *cached)
+
 # ==================== LIFESPAN ====================
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application"""
-    print("🚀 Universal Scraper API démarré")
-    print(f"📊 {len(scrapers)} scrapers disponibles")
+    log_listener = start_logging()
+    # Une seule session HTTP (pool keep-alive) pour tous les scrapers
+    app.state.http = open_shared_session(
+        max_connections=HTTP_POOL["max_connections"],
+        max_connections_per_host=HTTP_POOL["max_connections_per_host"],
+        keepalive_timeout=HTTP_POOL["keepalive_timeout"],
+        dns_cache_ttl=HTTP_POOL["dns_cache_ttl"],
+        connect_timeout=TIMEOUTS["connection"],
+        read_timeout=TIMEOUTS["read"],
+        read_bufsize=HTTP_POOL["read_bufsize"],
+        force_ipv4=HTTP_POOL["force_ipv4"],
+    )
+    scrapers.set_session(app.state.http)
+    logger.info("🚀 Universal Scraper API démarré")
+    logger.info("📊 %d scrapers disponibles", len(scrapers))
     yield
-    print("👋 Universal Scraper API arrêté")
+    await close_shared_session()
+    logger.info("👋 Universal Scraper API arrêté")
+    stop_logging(log_listener)
 
 # ==================== APP FASTAPI ====================
 
@@ -155,7 +437,8 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS
@@ -167,49 +450,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ==================== RÉPONSES STATIQUES ====================
+
+# Ces réponses ne dépendent que des scrapers enregistrés :
+# elles sont sérialisées une seule fois
+ROOT_JSON = orjson.dumps({
+    "name": "Universal Streaming Scraper API",
+    "version": "2.0.0",
+    "description": "API pour scraper animes, films et séries",
+    "docs": "/docs",
+    "endpoints": {
+        "search": "/api/search?q={query}&type={type}",
+        "details": "/api/details/{source}/{content_id}?type={type}",
+        "sources": "/api/sources/{source}/{content_id}?episode={episode_id}",
+        "episode": "/api/episode/{source}/{content_id}/{episode_id}",
+        "sources_list": "/api/sources",
+        "sources_complete": "/api/sources/complete?prefix={prefix}",
+        "health": "/health"
+    },
+    "scrapers_available": list(scrapers.keys())
+})
+
+HEALTH_JSON = orjson.dumps({
+    "status": "healthy",
+    "scrapers": len(scrapers),
+    "version": "2.0.0"
+})
+
+ROOT_ETAG = make_etag(ROOT_JSON)
+HEALTH_ETAG = make_etag(HEALTH_JSON)
+
+@lru_cache(maxsize=None)
+def sources_json() -> tuple:
+    """Liste des sources et son ETag, sérialisée au premier appel (instancie tous les scrapers)"""
+    payload = orjson.dumps([
+        {"id": key, "name": name, "base_url": base_url, "language": language, "types": types}
+        for key, name, base_url, language, types in sources_meta()
+    ])
+    return payload, make_etag(payload)
+
 # ==================== ENDPOINTS ====================
 
 @app.get("/", tags=["Root"])
-async def root():
+async def root(request: Request):
     """Page d'accueil de l'API"""
-    return {
-        "name": "Universal Streaming Scraper API",
-        "version": "2.0.0",
-        "description": "API pour scraper animes, films et séries",
-        "docs": "/docs",
-        "endpoints": {
-            "search": "/api/search?q={query}&type={type}",
-            "details": "/api/details/{source}/{content_id}?type={type}",
-            "sources": "/api/sources/{source}/{content_id}?episode={episode_id}",
-            "episode": "/api/episode/{source}/{content_id}/{episode_id}",
-            "sources_list": "/api/sources",
-            "health": "/health"
-        },
-        "scrapers_available": list(scrapers.keys())
-    }
+    return conditional_response(request, ROOT_JSON, ROOT_ETAG)
 
 @app.get("/health", tags=["Health"])
-async def health_check():
+async def health_check(request: Request):
     """Vérification de l'état de l'API"""
-    return {
-        "status": "healthy",
-        "scrapers": len(scrapers),
-        "version": "2.0.0"
-    }
-
-@app.get("/api/sources", tags=["Sources"], response_model=List[Dict[str, Any]])
-async def list_sources():
+    return conditional_response(request, HEALTH_JSON, HEALTH_ETAG)
+
+@app.get("/api/sources", tags=["Sources"])
+async def list_sources(request: Request):
     """Liste toutes les sources disponibles"""
-    sources = []
-    for key, scraper in scrapers.items():
-        sources.append({
-            "id": key,
-            "name": scraper.site_name,
-            "base_url": scraper.base_url,
-            "language": scraper.language,
-            "types": ["anime"] if "anime" in key else (["movie", "series"] if key in ["sflix", "fmovies", "lookmovie"] else ["movie", "series", "anime"])
-        })
-    return sources
+    return conditional_response(request, *sources_json())
+
+@app.get("/api/sources/complete", tags=["Sources"], response_model=List[str])
+async def complete_sources(
+    prefix: str = Query(default="", description="Début du nom de la source")
+):
+    """Autocomplétion des noms de sources (ex: "an" -> animeheaven, animesama)"""
+    return complete_source(prefix)
 
 @app.get("/api/search", tags=["Search"], response_model=ApiResponse)
 async def search_content(
@@ -230,47 +532,26 @@ async def search_content(
     sources_used = []
     
     # Déterminer quels scrapers utiliser
-    scrapers_to_use = []
-    
     if source and source in scrapers:
-        scrapers_to_use = [(source, scrapers[source])]
+        sources_to_use = (source,)
     else:
-        if type == "anime" or type == "all":
-            scrapers_to_use.extend([
-                ("gogoanime", scrapers["gogoanime"]),
-                ("animeheaven", scrapers["animeheaven"]),
-                ("animesama", scrapers["animesama"]),
-            ])
-        if type in ["movie", "series", "all"]:
-            scrapers_to_use.extend([
-                ("sflix", scrapers["sflix"]),
-                ("lookmovie", scrapers["lookmovie"]),
-                ("vidsrc", scrapers["vidsrc"]),
-            ])
-    
-    # Lancer les recherches en parallèle
-    async def search_with_scraper(name, scraper):
-        try:
-            return await scraper.search(q, limit)
-        except Exception as e:
-            print(f"Error with {name}: {e}")
-            return []
+        sources_to_use = SOURCES_BY_TYPE.get(type, ())
     
-    tasks = [search_with_scraper(name, scraper) for name, scraper in scrapers_to_use]
-    search_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Lancer les recherches en parallèle, sans attendre les sources lentes
+    # une fois la limite atteinte
+    search_results = await fan_out_search(sources_to_use, q, limit, enough=limit)
     
-    for (name, scraper), result in zip(scrapers_to_use, search_results):
-        if isinstance(result, list):
-            for item in result:
-                item['source'] = name
-            results.extend(result)
-            if result:
-                sources_used.append(name)
+    for name, result in search_results:
+        for item in result:
+            item['source'] = name
+        results.extend(result)
+        if result:
+            sources_used.append(name)
     
     # Limiter le nombre de résultats
     results = results[:limit]
     
-    return ApiResponse(
+    return api_response(
         success=len(results) > 0,
         message=f"{len(results)} résultats trouvés" if results else "Aucun résultat",
         data=results,
@@ -279,6 +560,7 @@ async def search_content(
 
 @app.get("/api/details/{source}/{content_id}", tags=["Details"], response_model=ApiResponse)
 async def get_details(
+    request: Request,
     source: str,
     content_id: str,
     type: Optional[str] = Query(default="movie", description="Type: movie, series, anime")
@@ -295,6 +577,11 @@ async def get_details(
     
     scraper = scrapers[source]
     
+    cache_key = ("details", source, content_id, type)
+    cached = cached_response(request, cache_key)
+    if cached:
+        return cached
+    
     try:
         if hasattr(scraper, 'get_details'):
             # Certains scrapers nécessitent le type
@@ -304,14 +591,17 @@ async def get_details(
                 result = await scraper.get_details(content_id)
             
             if result:
-                return ApiResponse(
+                return cache_response(
+                    request,
+                    cache_key,
                     success=True,
                     message="Détails récupérés avec succès",
-                    data=result.to_dict(),
+                    # Déjà sérialisé par orjson: inséré tel quel dans la réponse
+                    data=orjson.Fragment(result.to_json_bytes()),
                     sources_used=[source]
                 )
             else:
-                return ApiResponse(
+                return api_response(
                     success=False,
                     message="Contenu non trouvé",
                     data=None,
@@ -343,6 +633,8 @@ async def get_sources(
     
     scraper = scrapers[source]
     
+    # Pas de cache de réponse ici: les liens de streaming (jetons d'accès,
+    # liens ajax) expirent, ils sont redemandés à chaque appel
     try:
         if episode_id:
             # Récupérer les sources d'un épisode spécifique
@@ -355,17 +647,18 @@ async def get_sources(
                 details = await scraper.get_details(content_id)
             sources = details.sources if details else []
         else:
-            return ApiResponse(
+            return api_response(
                 success=False,
                 message="episode_id requis pour les séries/animes",
                 data=None,
                 sources_used=[source]
             )
         
-        return ApiResponse(
+        return api_response(
             success=len(sources) > 0,
             message=f"{len(sources)} sources trouvées" if sources else "Aucune source",
-            data=[s.to_dict() for s in sources],
+            # Dataclasses VideoSource encodées directement par orjson
+            data=sources,
             sources_used=[source]
         )
     
@@ -391,12 +684,14 @@ async def get_episode(
     scraper = scrapers[source]
     
     try:
+        # Toujours redemandées: les liens de streaming expirent
         sources = await scraper.get_episode_sources(content_id, episode_id)
         
-        return ApiResponse(
+        return api_response(
             success=len(sources) > 0,
             message=f"{len(sources)} sources trouvées" if sources else "Aucune source",
-            data=[s.to_dict() for s in sources],
+            # Dataclasses VideoSource encodées directement par orjson
+            data=sources,
             sources_used=[source]
         )
     
@@ -425,14 +720,14 @@ async def get_download_links(
         if hasattr(scraper, 'get_download_links'):
             links = await scraper.get_download_links(content_id, episode_id)
             
-            return ApiResponse(
+            return api_response(
                 success=len(links) > 0,
                 message=f"{len(links)} liens trouvés" if links else "Aucun lien",
                 data=links,
                 sources_used=[source]
             )
         else:
-            return ApiResponse(
+            return api_response(
                 success=False,
                 message="Ce scraper ne supporte pas les liens de téléchargement",
                 data=[],
@@ -457,35 +752,29 @@ async def multi_search(
     all_results = []
     sources_used = []
     
-    async def search_single(name, scraper):
-        try:
-            results = await scraper.search(q, limit)
-            for r in results:
-                r['source'] = name
-            return name, results
-        except:
-            return name, []
-    
     # Lancer toutes les recherches en parallèle
-    tasks = [search_single(name, scraper) for name, scraper in scrapers.items()]
-    results = await asyncio.gather(*tasks)
+    results = await fan_out_search(ALL_SOURCES, q, limit)
     
     for name, result_list in results:
+        for r in result_list:
+            r['source'] = name
         if result_list:
             all_results.extend(result_list)
             sources_used.append(name)
     
-    # Trier par pertinence (simple: titre contenant la requête)
-    query_lower = q.lower()
-    all_results.sort(key=lambda x: (
-        0 if query_lower in x.get('title', '').lower() else 1,
-        x.get('title', '')
-    ))
+    # Garder les meilleurs par pertinence (simple: titre contenant la requête)
+    # sans trier toute la liste ; titres et correspondances calculés une fois,
+    # en tableaux parallèles indexés comme all_results
+    query_lower = q.casefold()
+    titles = [r.get('title', '') for r in all_results]
+    misses = [0 if query_lower in t.casefold() else 1 for t in titles]
+    order = heapq.nsmallest(limit * 3, range(len(titles)), key=lambda i: (misses[i], titles[i]))
+    top_results = [all_results[i] for i in order]
     
-    return ApiResponse(
+    return api_response(
         success=len(all_results) > 0,
         message=f"{len(all_results)} résultats de {len(sources_used)} sources",
-        data=all_results[:limit * 3],
+        data=top_results,
         sources_used=sources_used
     )
 
@@ -503,7 +792,7 @@ async def get_trending(
         raise HTTPException(status_code=400, detail=f"Source '{source}' non supportée")
     
     # Pour l'instant, retourner une recherche vide ou utiliser des listes prédéfinies
-    return ApiResponse(
+    return api_response(
         success=True,
         message="Utilisez /api/search pour rechercher du contenu",
         data=[],
@@ -514,9 +803,14 @@ async def get_trending(
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
+    reload = os.environ.get("DEBUG", "false").lower() == "true"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
-        reload=os.environ.get("DEBUG", "false").lower() == "true"
+        loop="uvloop",
+        http="httptools",
+        # Le rechargement automatique ne fonctionne qu'avec un seul worker
+        workers=1 if reload else int(os.environ.get("WORKERS", os.cpu_count() or 2)),
+        reload=reload
     )
@@ -3,10 +3,39 @@ Universal Scraper Package
 Supports: Anime, Movies, Series from multiple sources
 """
 
+import importlib
+import logging
+
 from .base_scraper import BaseScraper, ScraperResult, Episode, Season, VideoSource
-from .anime_scrapers import GogoanimeScraper, ZoroScraper, AnimeHeavenScraper, AnimeSamaScraper
-from .movie_scrapers import SFlixScraper, FMoviesScraper, LookMovieScraper, VidSrcScraper
-from .utils import retry_request, bypass_cloudflare, extract_video_url
+
+# Bibliothèque: pas de sortie tant que l'application ne configure pas le
+# logger "scrapers" (main.start_logging le branche sur sa file)
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Scrapers et utilitaires importés à la demande (PEP 562): leurs modules
+# chargent aiohttp, BeautifulSoup, lxml... dont l'import est coûteux
+_LAZY_IMPORTS = {
+    'GogoanimeScraper': '.anime_scrapers',
+    'ZoroScraper': '.anime_scrapers',
+    'AnimeHeavenScraper': '.anime_scrapers',
+    'AnimeSamaScraper': '.anime_scrapers',
+    'SFlixScraper': '.movie_scrapers',
+    'FMoviesScraper': '.movie_scrapers',
+    'LookMovieScraper': '.movie_scrapers',
+    'VidSrcScraper': '.movie_scrapers',
+    'retry_request': '.utils',
+    'bypass_cloudflare': '.utils',
+    'bypass_cloudflare_async': '.utils',
+    'extract_video_url': '.utils',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'BaseScraper',
@@ -24,5 +53,6 @@ __all__ = [
     'VidSrcScraper',
     'retry_request',
     'bypass_cloudflare',
+    'bypass_cloudflare_async',
     'extract_video_url',
 ]
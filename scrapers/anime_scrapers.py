@@ -3,14 +3,72 @@ Scrapers pour sites d'anime
 """
 
 import re
+import asyncio
 import json
 from typing import List, Dict, Optional, Any
-from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
-import aiohttp
+from urllib.parse import urljoin, urlsplit, quote
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 
 from .base_scraper import BaseScraper, ScraperResult, Episode, VideoSource, VideoQuality, SourceType
-from .utils import fetch_page, fetch_json, bypass_cloudflare, extract_m3u8_from_script, get_random_headers
+from .utils import (
+    bypass_cloudflare_async, extract_m3u8_from_script, get_random_headers,
+    parse_html, has_class, node_text, first_node, id_from_href, async_ttl_cache
+)
+
+# Motifs compilés une seule fois à l'import
+_GENRE_HREF_RE = re.compile(r'/genre/')
+_EPISODE_HREF_RE = re.compile(r'/episode/')
+_RELEASED_RE = re.compile(r'Released:\s*(\d{4})')
+_STATUS_RE = re.compile(r'Status:\s*(\w+)')
+_MOVIE_ID_RE = re.compile(r'movie_id\s*=\s*["\']?(\d+)')
+_MOVIE_INPUT_RE = re.compile(r'<input\b[^>]*\bid=["\']movie_id["\'][^>]*>', re.I)
+_VALUE_ATTR_RE = re.compile(r'\bvalue=["\']([^"\']*)["\']', re.I)
+_YEAR_RE = re.compile(r'(\d{4})')
+_EPISODE_NUM_RE = re.compile(r'Episode\s*(\d+)', re.I)
+
+# Sélecteurs XPath des pages de recherche (compilés une seule fois)
+_FIRST_LINK_XPATH = etree.XPath('(.//a)[1]')
+_FIRST_IMG_XPATH = etree.XPath('(.//img)[1]')
+_GOGO_ITEMS_XPATH = etree.XPath(f'//div[{has_class("img")}]')
+_ZORO_ITEMS_XPATH = etree.XPath(f'//div[{has_class("flw-item")}]')
+_ZORO_LINK_XPATH = etree.XPath(f'(.//a[{has_class("film-poster-ahref")}])[1]')
+_ZORO_TITLE_XPATH = etree.XPath(f'(.//h3[{has_class("film-name")}])[1]')
+_HEAVEN_ITEMS_XPATH = etree.XPath(f'//div[{has_class("condd")}]')
+_HEAVEN_TITLE_XPATH = etree.XPath(f'(.//div[{has_class("condd")}])[1]')
+
+# Pages d'épisode: attributs extraits en chaînes simples (smart_strings=False)
+_IFRAME_SRC_XPATH = etree.XPath('//iframe/@src', smart_strings=False)
+_GOGO_DOWNLOAD_HREF_XPATH = etree.XPath(f'(//div[{has_class("favorites_book")}])[1]//a/@href', smart_strings=False)
+_GOGO_EPISODE_LINKS_XPATH = etree.XPath(f'//a[{has_class("active")}]')
+
+# Pages de lecteur: seuls ces fragments sont construits (parse_only). Le
+# strainer voit l'attribut class brut ("a player"), d'où le motif par mot
+_IFRAME_STRAINER = SoupStrainer('iframe')
+_PLAYER_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)player(?:\s|$)'))
+
+# Hébergeurs connus, reconnus sur un label du nom d'hôte (ces hébergeurs
+# changent souvent d'extension et de miroir: dood.la, dood.co.in, doods.pro,
+# mixdrop.co.uk...), testés dans l'ordre
+_EMBED_HOSTS = {
+    'streamtape': SourceType.STREAMTAPE,
+    'dood': SourceType.DOODSTREAM,
+    'mixdrop': SourceType.MIXDROP,
+}
+
+def _embed_type(url: str) -> SourceType:
+    """Type de source d'après le nom d'hôte de l'iframe (IFRAME si inconnu)"""
+    for label in (urlsplit(url).hostname or '').split('.'):
+        # Un label qui commence par le nom connu: doodstream, doods, mixdrop...
+        for name, source_type in _EMBED_HOSTS.items():
+            if label.startswith(name):
+                return source_type
+    return SourceType.IFRAME
+
+def _episode_number(text: str) -> int:
+    """Numéro d'épisode lu dans un libellé "Episode N" (0 si absent)"""
+    match = _EPISODE_NUM_RE.search(text)
+    return int(match.group(1)) if match else 0
 
 class GogoanimeScraper(BaseScraper):
     """Scraper pour Gogoanime (Anitaku)"""
@@ -22,63 +80,66 @@ class GogoanimeScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur Gogoanime"""
         search_url = f"{self.base_url}/search.html?keyword={quote(query)}"
-        html = await fetch_page(search_url, self.headers)
+        html = await self._fetch_page_bytes(search_url)
         
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'lxml')
+        tree = parse_html(html)
         results = []
         
         # Les résultats sont dans des div avec classe "img"
-        items = soup.find_all('div', class_='img')
+        items = _GOGO_ITEMS_XPATH(tree)
         
         for item in items[:limit]:
-            link = item.find('a')
-            if not link:
+            link = first_node(_FIRST_LINK_XPATH, item)
+            if link is None:
                 continue
             
-            title_elem = link.find('img')
-            title = title_elem.get('alt', '') if title_elem else link.get('title', '')
+            title_elem = first_node(_FIRST_IMG_XPATH, link)
+            title = title_elem.get('alt', '') if title_elem is not None else link.get('title', '')
             href = link.get('href', '')
             
             if href:
-                content_id = href.split('/')[-1] if '/' in href else href
+                content_id = id_from_href(href)
                 results.append({
                     'id': content_id,
                     'title': title,
                     'url': urljoin(self.base_url, href),
-                    'poster': title_elem.get('src', '') if title_elem else '',
+                    'poster': title_elem.get('src', '') if title_elem is not None else '',
                     'type': 'anime',
                     'source': self.site_name
                 })
         
         return results
     
+    @async_ttl_cache()
     async def get_details(self, content_id: str) -> Optional[ScraperResult]:
         """Récupère les détails d'un anime"""
         detail_url = f"{self.base_url}/category/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        html = await self._fetch_page(detail_url)
         
         if not html:
             # Essayer avec bypass
-            html = bypass_cloudflare(detail_url, self.headers)
+            html = await bypass_cloudflare_async(detail_url, self.headers)
             if not html:
                 return None
         
         soup = BeautifulSoup(html, 'lxml')
         
+        # Bloc d'infos (titre, image, année, statut)
+        info_body = soup.find('div', class_='anime_info_body')
+        
         # Titre
-        title_elem = soup.find('div', class_='anime_info_body')
         title = ""
-        if title_elem:
-            h1 = title_elem.find('h1')
+        if info_body:
+            h1 = info_body.find('h1')
             if h1:
                 title = h1.get_text(strip=True)
         
         # Image
         poster = ""
-        img = soup.find('div', class_='anime_info_body').find('img') if soup.find('div', class_='anime_info_body') else None
+        img = info_body.find('img') if info_body else None
         if img:
             poster = img.get('src', '')
         
@@ -89,26 +150,22 @@ class GogoanimeScraper(BaseScraper):
             description = desc_div.get_text(strip=True)
         
         # Genres
-        genres = []
-        genre_links = soup.find_all('a', href=re.compile(r'/genre/'))
-        for link in genre_links:
-            genres.append(link.get_text(strip=True))
+        genres = list(dict.fromkeys(link.get_text(strip=True) for link in soup.find_all('a', href=_GENRE_HREF_RE)))
         
         # Année et autres infos
         year = ""
         status = ""
-        type_info = soup.find('div', class_='anime_info_body')
-        if type_info:
-            text = type_info.get_text()
-            year_match = re.search(r'Released:\s*(\d{4})', text)
+        if info_body:
+            text = info_body.get_text()
+            year_match = _RELEASED_RE.search(text)
             if year_match:
                 year = year_match.group(1)
-            status_match = re.search(r'Status:\s*(\w+)', text)
+            status_match = _STATUS_RE.search(text)
             if status_match:
                 status = status_match.group(1)
         
         # Récupérer les épisodes
-        episodes = await self._get_episodes(content_id, soup)
+        episodes = await self._get_episodes(content_id, html)
         
         result = ScraperResult(
             title=title,
@@ -117,7 +174,7 @@ class GogoanimeScraper(BaseScraper):
             description=description,
             poster=poster,
             release_year=year,
-            genres=list(set(genres)),
+            genres=genres,
             status=status.lower(),
             episodes=episodes,
             episode_count=len(episodes),
@@ -127,108 +184,78 @@ class GogoanimeScraper(BaseScraper):
         
         return result
     
-    async def _get_episodes(self, content_id: str, soup: BeautifulSoup) -> List[Episode]:
+    async def _get_episodes(self, content_id: str, html: str) -> List[Episode]:
         """Récupère la liste des épisodes"""
         episodes = []
         
-        # Trouver l'ID de la série pour l'API
+        # Trouver l'ID de la série pour l'API: une recherche regex sur la page
+        # brute, d'abord dans <input id="movie_id">, sinon dans les scripts
         movie_id = ""
-        input_id = soup.find('input', {'id': 'movie_id'})
-        if input_id:
-            movie_id = input_id.get('value', '')
+        input_tag = _MOVIE_INPUT_RE.search(html)
+        if input_tag:
+            value = _VALUE_ATTR_RE.search(input_tag.group(0))
+            if value:
+                movie_id = value.group(1)
         
         if not movie_id:
-            # Essayer de trouver dans le script
-            scripts = soup.find_all('script')
-            for script in scripts:
-                text = script.string if script else ""
-                if text and 'movie_id' in text:
-                    match = re.search(r'movie_id\s*=\s*["\']?(\d+)', text)
-                    if match:
-                        movie_id = match.group(1)
-                        break
+            match = _MOVIE_ID_RE.search(html)
+            if match:
+                movie_id = match.group(1)
         
         if movie_id:
             # Utiliser l'API pour récupérer les épisodes
             episode_list_url = f"{self.ajax_url}/load-list-episode?ep_start=0&ep_end=9999&id={movie_id}"
-            episode_html = await fetch_page(episode_list_url, self.headers)
+            episode_html = await self._fetch_page_bytes(episode_list_url)
             
             if episode_html:
-                ep_soup = BeautifulSoup(episode_html, 'lxml')
-                ep_links = ep_soup.find_all('a', class_='active')
-                
-                for i, link in enumerate(reversed(ep_links), 1):
-                    ep_href = link.get('href', '').strip()
-                    ep_title = link.get_text(strip=True)
-                    ep_id = ep_href.split('/')[-1].replace('.html', '') if ep_href else f"ep{i}"
-                    
-                    episodes.append(Episode(
+                ep_links = [
+                    (link.get('href', '').strip(), node_text(link))
+                    for link in _GOGO_EPISODE_LINKS_XPATH(parse_html(episode_html))
+                ]
+                episodes = [
+                    Episode(
                         number=i,
                         title=ep_title or f"Episode {i}",
-                        id=ep_id,
+                        id=id_from_href(ep_href).removesuffix('.html') if ep_href else f"ep{i}",
                         sources=[]  # Sera rempli à la demande
-                    ))
+                    )
+                    for i, (ep_href, ep_title) in enumerate(reversed(ep_links), 1)
+                ]
         
         return episodes
     
     async def get_episode_sources(self, content_id: str, episode_id: str) -> List[VideoSource]:
         """Récupère les sources vidéo d'un épisode"""
         episode_url = f"{self.base_url}/{episode_id}"
-        html = await fetch_page(episode_url, self.headers)
+        html = await self._fetch_page_bytes(episode_url)
         
         if not html:
             return []
         
         sources = []
+        tree = parse_html(html)
         
-        # Chercher les iframes d'embed
-        soup = BeautifulSoup(html, 'lxml')
-        iframes = soup.find_all('iframe')
-        
-        for iframe in iframes:
-            src = iframe.get('src', '')
+        # Chercher les iframes d'embed, et détecter le type d'embed
+        for src in _IFRAME_SRC_XPATH(tree):
             if src:
                 if src.startswith('//'):
                     src = 'https:' + src
                 
-                # Détecter le type d'embed
-                if 'streamtape' in src:
-                    sources.append(VideoSource(
-                        url=src,
-                        type=SourceType.STREAMTAPE,
-                        referer=episode_url
-                    ))
-                elif 'dood' in src:
-                    sources.append(VideoSource(
-                        url=src,
-                        type=SourceType.DOODSTREAM,
-                        referer=episode_url
-                    ))
-                elif 'mixdrop' in src:
-                    sources.append(VideoSource(
-                        url=src,
-                        type=SourceType.MIXDROP,
-                        referer=episode_url
-                    ))
-                else:
-                    sources.append(VideoSource(
-                        url=src,
-                        type=SourceType.IFRAME,
-                        referer=episode_url
-                    ))
+                source_type = _embed_type(src)
+                sources.append(VideoSource(
+                    url=src,
+                    type=source_type,
+                    referer=episode_url
+                ))
         
         # Chercher les liens de téléchargement
-        download_div = soup.find('div', class_='favorites_book')
-        if download_div:
-            links = download_div.find_all('a', href=True)
-            for link in links:
-                href = link.get('href', '')
-                if 'download' in href.lower():
-                    sources.append(VideoSource(
-                        url=href,
-                        type=SourceType.DIRECT,
-                        referer=episode_url
-                    ))
+        for href in _GOGO_DOWNLOAD_HREF_XPATH(tree):
+            if 'download' in href.lower():
+                sources.append(VideoSource(
+                    url=href,
+                    type=SourceType.DIRECT,
+                    referer=episode_url
+                ))
         
         return sources
 
@@ -242,45 +269,46 @@ class ZoroScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur AniWatch"""
         search_url = f"{self.base_url}/search?keyword={quote(query)}"
-        html = await fetch_page(search_url, self.headers)
+        html = await self._fetch_page_bytes(search_url)
         
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'lxml')
+        tree = parse_html(html)
         results = []
         
         # Les résultats sont dans des div avec classe "film_list-wrap"
-        items = soup.find_all('div', class_='flw-item')
+        items = _ZORO_ITEMS_XPATH(tree)
         
         for item in items[:limit]:
-            link = item.find('a', class_='film-poster-ahref')
-            img = item.find('img')
-            title_elem = item.find('h3', class_='film-name')
+            link = first_node(_ZORO_LINK_XPATH, item)
+            img = first_node(_FIRST_IMG_XPATH, item)
+            title_elem = first_node(_ZORO_TITLE_XPATH, item)
             
-            if link:
+            if link is not None:
                 href = link.get('href', '')
-                title = title_elem.get_text(strip=True) if title_elem else (img.get('alt', '') if img else '')
-                content_id = href.split('/')[-1].split('?')[0] if '/' in href else href
+                title = node_text(title_elem) if title_elem is not None else (img.get('alt', '') if img is not None else '')
+                content_id = id_from_href(href)
                 
                 results.append({
                     'id': content_id,
                     'title': title,
                     'url': urljoin(self.base_url, href),
-                    'poster': img.get('data-src', img.get('src', '')) if img else '',
+                    'poster': img.get('data-src', img.get('src', '')) if img is not None else '',
                     'type': 'anime',
                     'source': self.site_name
                 })
         
         return results
     
+    @async_ttl_cache()
     async def get_details(self, content_id: str) -> Optional[ScraperResult]:
         """Récupère les détails d'un anime"""
         detail_url = f"{self.base_url}/anime/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        html = await self._fetch_page(detail_url)
         
         if not html:
-            html = bypass_cloudflare(detail_url, self.headers)
+            html = await bypass_cloudflare_async(detail_url, self.headers)
             if not html:
                 return None
         
@@ -305,10 +333,7 @@ class ZoroScraper(BaseScraper):
             poster = img.get('data-src', img.get('src', ''))
         
         # Genres
-        genres = []
-        genre_links = soup.find_all('a', href=re.compile(r'/genre/'))
-        for link in genre_links:
-            genres.append(link.get_text(strip=True))
+        genres = list(dict.fromkeys(link.get_text(strip=True) for link in soup.find_all('a', href=_GENRE_HREF_RE)))
         
         # Infos additionnelles
         info_div = soup.find('div', class_='anisc-info')
@@ -316,7 +341,7 @@ class ZoroScraper(BaseScraper):
         status = ""
         if info_div:
             text = info_div.get_text()
-            year_match = re.search(r'(\d{4})', text)
+            year_match = _YEAR_RE.search(text)
             if year_match:
                 year = year_match.group(1)
             if 'ongoing' in text.lower():
@@ -334,7 +359,7 @@ class ZoroScraper(BaseScraper):
             description=description,
             poster=poster,
             release_year=year,
-            genres=list(set(genres)),
+            genres=genres,
             status=status,
             episodes=episodes,
             episode_count=len(episodes),
@@ -344,24 +369,26 @@ class ZoroScraper(BaseScraper):
         
         return result
     
+    @async_ttl_cache()
     async def _get_episodes_api(self, content_id: str) -> List[Episode]:
         """Récupère les épisodes via l'API"""
         episodes = []
         
         # API pour récupérer les épisodes
         api_url = f"{self.api_url}/v2/episode/list/{content_id}"
-        data = await fetch_json(api_url, self.headers)
+        data = await self._fetch_json(api_url)
         
         if data and 'data' in data:
-            episodes_data = data['data'].get('episodes', [])
-            for ep in episodes_data:
-                episodes.append(Episode(
+            episodes = [
+                Episode(
                     number=ep.get('number', 0),
                     title=ep.get('title', f"Episode {ep.get('number', 0)}"),
                     id=str(ep.get('id', '')),
                     sources=[],
                     thumbnail=ep.get('image', '')
-                ))
+                )
+                for ep in data['data'].get('episodes', [])
+            ]
         
         return episodes
     
@@ -369,29 +396,29 @@ class ZoroScraper(BaseScraper):
         """Récupère les sources vidéo"""
         # API pour les sources
         api_url = f"{self.api_url}/v2/episode/servers?episodeId={episode_id}"
-        data = await fetch_json(api_url, self.headers)
+        data = await self._fetch_json(api_url)
         
         sources = []
         
         if data and 'data' in data:
             servers = data['data'].get('servers', [])
-            for server in servers:
-                server_name = server.get('serverName', '').lower()
-                server_id = server.get('serverId', '')
-                
-                # Récupérer l'URL de la source
-                source_api = f"{self.api_url}/v2/episode/sources?serverId={server_id}"
-                source_data = await fetch_json(source_api, self.headers)
-                
+            
+            # Récupérer l'URL de la source de chaque serveur, en parallèle
+            source_apis = [
+                f"{self.api_url}/v2/episode/sources?serverId={server.get('serverId', '')}"
+                for server in servers
+            ]
+            for source_data in await asyncio.gather(*(self._fetch_json(url) for url in source_apis)):
                 if source_data and 'data' in source_data:
                     source_info = source_data['data']
                     link = source_info.get('link', '')
                     
                     if link:
+                        is_hls = '.m3u8' in link
                         sources.append(VideoSource(
                             url=link,
-                            type=SourceType.HLS if '.m3u8' in link else SourceType.DIRECT,
-                            is_m3u8='.m3u8' in link,
+                            type=SourceType.HLS if is_hls else SourceType.DIRECT,
+                            is_m3u8=is_hls,
                             referer=self.base_url
                         ))
         
@@ -406,24 +433,24 @@ class AnimeHeavenScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur AnimeHeaven"""
         search_url = f"{self.base_url}/search?q={quote(query)}"
-        html = await fetch_page(search_url, self.headers)
+        html = await self._fetch_page_bytes(search_url)
         
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'lxml')
+        tree = parse_html(html)
         results = []
         
-        items = soup.find_all('div', class_='condd')
+        items = _HEAVEN_ITEMS_XPATH(tree)
         
         for item in items[:limit]:
-            link = item.find('a')
-            if link:
+            link = first_node(_FIRST_LINK_XPATH, item)
+            if link is not None:
                 href = link.get('href', '')
-                title_elem = link.find('div', class_='condd')
-                title = title_elem.get_text(strip=True) if title_elem else href
+                title_elem = first_node(_HEAVEN_TITLE_XPATH, link)
+                title = node_text(title_elem) if title_elem is not None else href
                 
-                content_id = href.split('/')[-1] if '/' in href else href
+                content_id = id_from_href(href)
                 
                 results.append({
                     'id': content_id,
@@ -435,21 +462,24 @@ class AnimeHeavenScraper(BaseScraper):
         
         return results
     
+    @async_ttl_cache()
     async def get_details(self, content_id: str) -> Optional[ScraperResult]:
         """Récupère les détails"""
         detail_url = f"{self.base_url}/anime/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        html = await self._fetch_page(detail_url)
         
         if not html:
             return None
         
         soup = BeautifulSoup(html, 'lxml')
         
+        # Bloc d'infos (titre, poster)
+        infobox = soup.find('div', class_='infoboxc')
+        
         # Titre
         title = ""
-        title_elem = soup.find('div', class_='infoboxc')
-        if title_elem:
-            h1 = title_elem.find('h1')
+        if infobox:
+            h1 = infobox.find('h1')
             if h1:
                 title = h1.get_text(strip=True)
         
@@ -461,27 +491,23 @@ class AnimeHeavenScraper(BaseScraper):
         
         # Poster
         poster = ""
-        img = soup.find('div', class_='infoboxc').find('img') if soup.find('div', class_='infoboxc') else None
+        img = infobox.find('img') if infobox else None
         if img:
             poster = urljoin(self.base_url, img.get('src', ''))
         
         # Épisodes
-        episodes = []
-        ep_links = soup.find_all('a', href=re.compile(r'/episode/'))
-        
-        for link in ep_links:
-            href = link.get('href', '')
-            ep_text = link.get_text(strip=True)
-            ep_match = re.search(r'Episode\s*(\d+)', ep_text, re.I)
-            ep_num = int(ep_match.group(1)) if ep_match else 0
-            
-            ep_id = href.split('/')[-1] if '/' in href else href
-            
-            episodes.append(Episode(
-                number=ep_num,
+        ep_links = [
+            (link.get('href', ''), link.get_text(strip=True))
+            for link in soup.find_all('a', href=_EPISODE_HREF_RE)
+        ]
+        episodes = [
+            Episode(
+                number=_episode_number(ep_text),
                 title=ep_text,
-                id=ep_id
-            ))
+                id=id_from_href(href)
+            )
+            for href, ep_text in ep_links
+        ]
         
         # Trier par numéro d'épisode
         episodes.sort(key=lambda x: x.number)
@@ -503,13 +529,13 @@ class AnimeHeavenScraper(BaseScraper):
     async def get_episode_sources(self, content_id: str, episode_id: str) -> List[VideoSource]:
         """Récupère les sources"""
         episode_url = f"{self.base_url}/episode/{episode_id}"
-        html = await fetch_page(episode_url, self.headers)
+        html = await self._fetch_page(episode_url)
         
         if not html:
             return []
         
         sources = []
-        soup = BeautifulSoup(html, 'lxml')
+        soup = BeautifulSoup(html, 'lxml', parse_only=_IFRAME_STRAINER)
         
         # Chercher les iframes
         iframes = soup.find_all('iframe')
@@ -535,30 +561,28 @@ class AnimeSamaScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur AnimeSama"""
         search_url = f"{self.base_url}/template-php/defaut/fetch.php?search={quote(query)}"
+        data = await self._fetch_json(search_url)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(search_url, headers=self.headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = []
-                    
-                    for item in data[:limit]:
-                        results.append({
-                            'id': item.get('url', '').split('/')[-1],
-                            'title': item.get('title', ''),
-                            'url': urljoin(self.base_url, item.get('url', '')),
-                            'poster': item.get('image', ''),
-                            'type': 'anime',
-                            'source': self.site_name
-                        })
-                    
-                    return results
-                return []
+        if not data:
+            return []
+        
+        return [
+            {
+                'id': id_from_href(item.get('url', '')),
+                'title': item.get('title', ''),
+                'url': urljoin(self.base_url, item.get('url', '')),
+                'poster': item.get('image', ''),
+                'type': 'anime',
+                'source': self.site_name
+            }
+            for item in data[:limit]
+        ]
     
+    @async_ttl_cache()
     async def get_details(self, content_id: str) -> Optional[ScraperResult]:
         """Récupère les détails"""
         detail_url = f"{self.base_url}/anime/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        html = await self._fetch_page(detail_url)
         
         if not html:
             return None
@@ -591,19 +615,14 @@ class AnimeSamaScraper(BaseScraper):
                 genres.append(link.get_text(strip=True))
         
         # Épisodes - AnimeSama a une structure spéciale avec saisons
-        episodes = []
-        ep_list = soup.find_all('a', class_='episode')
-        
-        for i, ep in enumerate(ep_list, 1):
-            ep_href = ep.get('href', '')
-            ep_title = ep.get_text(strip=True)
-            ep_id = ep_href.split('/')[-1] if '/' in ep_href else str(i)
-            
-            episodes.append(Episode(
+        episodes = [
+            Episode(
                 number=i,
-                title=ep_title,
-                id=ep_id
-            ))
+                title=ep.get_text(strip=True),
+                id=id_from_href(ep.get('href', '')) if '/' in ep.get('href', '') else str(i)
+            )
+            for i, ep in enumerate(soup.find_all('a', class_='episode'), 1)
+        ]
         
         result = ScraperResult(
             title=title,
@@ -623,13 +642,13 @@ class AnimeSamaScraper(BaseScraper):
     async def get_episode_sources(self, content_id: str, episode_id: str) -> List[VideoSource]:
         """Récupère les sources"""
         episode_url = f"{self.base_url}/anime/{content_id}/{episode_id}"
-        html = await fetch_page(episode_url, self.headers)
+        html = await self._fetch_page(episode_url)
         
         if not html:
             return []
         
         sources = []
-        soup = BeautifulSoup(html, 'lxml')
+        soup = BeautifulSoup(html, 'lxml', parse_only=_PLAYER_STRAINER)
         
         # Chercher les lecteurs vidéo
         players = soup.find_all('div', class_='player')
@@ -647,3 +666,19 @@ class AnimeSamaScraper(BaseScraper):
                     ))
         
         return sources
+
+
+ANIME_SCRAPERS = (GogoanimeScraper, ZoroScraper, AnimeHeavenScraper, AnimeSamaScraper)
+
+async def search_all(query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Recherche sur tous les sites d'anime en parallèle
+    
+    Les requêtes partent en même temps sur la session partagée: la durée totale
+    est celle du site le plus lent, pas la somme. Un site en erreur est ignoré.
+    """
+    results = await asyncio.gather(
+        *(scraper_class().search(query, limit) for scraper_class in ANIME_SCRAPERS),
+        return_exceptions=True
+    )
+    return [item for group in results if not isinstance(group, BaseException) for item in group]
@@ -2,13 +2,26 @@
 Base Scraper Class - Interface commune pour tous les scrapers
 """
 
+import asyncio
+import bisect
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any, Union
-from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Any, Union, Mapping, Tuple
+from types import MappingProxyType
+from dataclasses import dataclass, field, fields
 from enum import Enum
+import re
 import json
 import hashlib
-from datetime import datetime
+import orjson
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import accumulate
+
+# Motifs des helpers de parsing, compilés une seule fois
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_DURATION_MIN_RE = re.compile(r'(\d+)\s*min')
+_DURATION_HOURS_RE = re.compile(r'(\d+)\s*h')
+_WHITESPACE_RE = re.compile(r'\s+')
 
 class VideoQuality(Enum):
     SD_360P = "360p"
@@ -18,6 +31,32 @@ class VideoQuality(Enum):
     FHD_1440P = "1440p"
     UHD_4K = "4k"
     UNKNOWN = "unknown"
+    
+    @classmethod
+    def from_value(cls, value: str) -> "VideoQuality":
+        """Membre correspondant à une valeur texte, UNKNOWN si elle est inconnue"""
+        return _QUALITY_BY_VALUE.get(value, cls.UNKNOWN)
+
+_QUALITY_BY_VALUE = {quality.value: quality for quality in VideoQuality}
+
+# Jetons de qualité, du plus précis au plus général pour qu'une seule passe
+# de regex reconnaisse "fhd"/"full hd" avant "hd"
+_QUALITY_TOKENS = {
+    '2160p': VideoQuality.UHD_4K,
+    '4k': VideoQuality.UHD_4K,
+    '1440p': VideoQuality.FHD_1440P,
+    '2k': VideoQuality.FHD_1440P,
+    '1080p': VideoQuality.HD_1080P,
+    'full hd': VideoQuality.HD_1080P,
+    'fhd': VideoQuality.HD_1080P,
+    '720p': VideoQuality.HD_720P,
+    'hd': VideoQuality.HD_720P,
+    '480p': VideoQuality.SD_480P,
+    '360p': VideoQuality.SD_360P,
+}
+_QUALITY_RE = re.compile('|'.join(map(re.escape, _QUALITY_TOKENS)))
+# Plusieurs jetons dans le même texte: la meilleure qualité l'emporte
+_QUALITY_RANK = {quality: rank for rank, quality in enumerate(dict.fromkeys(_QUALITY_TOKENS.values()))}
 
 class SourceType(Enum):
     DIRECT = "direct"
@@ -32,32 +71,75 @@ class SourceType(Enum):
     MP4UPLOAD = "mp4upload"
     FILEMOON = "filemoon"
     EMBED = "embed"
+    
+    @classmethod
+    def from_value(cls, value: str, default: Optional["SourceType"] = None) -> Optional["SourceType"]:
+        """Membre correspondant à une valeur texte, `default` si elle est inconnue"""
+        return _SOURCE_TYPE_BY_VALUE.get(value, default)
+
+_SOURCE_TYPE_BY_VALUE = {source_type.value: source_type for source_type in SourceType}
 
-@dataclass
+# Valeur texte posée sur chaque membre: un simple attribut d'instance, là où
+# .value passe par un descripteur à chaque accès
+_STR_ENUMS = frozenset({VideoQuality, SourceType})
+for _enum in _STR_ENUMS:
+    for _member in _enum:
+        _member._str = _member.value
+del _enum, _member
+
+# Types renvoyés tels quels par to_dict, sans copie ni introspection
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})
+
+def _to_plain(value: Any) -> Any:
+    """Convertit une valeur de champ en types JSON natifs (Enum -> value, dataclass -> dict)"""
+    value_type = type(value)
+    if value_type in _ATOMIC_TYPES:
+        return value
+    if value_type is list or value_type is tuple:
+        # map() évite la boucle Python d'une compréhension (mesuré plus rapide
+        # qu'une liste pré-allouée remplie par index)
+        return list(map(_to_plain, value))
+    if value_type in _DATACLASS_TYPES:
+        return value.to_dict()
+    if value_type in _STR_ENUMS:
+        return value._str
+    if value_type is dict:
+        return value.copy()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return list(map(_to_plain, value))
+    if isinstance(value, dict):
+        return value.copy()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+@dataclass(frozen=True, slots=True)
 class VideoSource:
-    """Représente une source vidéo"""
+    """Représente une source vidéo (immuable et hashable: set(sources) dédoublonne)"""
     url: str
     type: SourceType
     quality: VideoQuality = VideoQuality.UNKNOWN
     language: str = "en"
     is_m3u8: bool = False
-    headers: Dict[str, str] = field(default_factory=dict)
-    subtitles: List[Dict[str, str]] = field(default_factory=list)
+    # Exclus du hash (non hashables), mais toujours comparés par __eq__.
+    # subtitles est un tuple: défaut vide partagé, aucune liste allouée par source
+    headers: Dict[str, str] = field(default_factory=dict, hash=False)
+    subtitles: Tuple[Dict[str, str], ...] = field(default=(), hash=False)
     referer: str = ""
+    # Résultat de to_dict, mémorisé: la source est immuable (ignoré par orjson)
+    _dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "url": self.url,
-            "type": self.type.value,
-            "quality": self.quality.value,
-            "language": self.language,
-            "is_m3u8": self.is_m3u8,
-            "headers": self.headers,
-            "subtitles": self.subtitles,
-            "referer": self.referer,
-        }
+        """Dict mémorisé à la première conversion: à traiter en lecture seule"""
+        result = self._dict
+        if result is None:
+            result = {name: _to_plain(getattr(self, name)) for name in self._FIELD_NAMES}
+            object.__setattr__(self, '_dict', result)
+        return result
 
-@dataclass
+@dataclass(slots=True)
 class Episode:
     """Représente un épisode d'anime ou série"""
     number: int
@@ -68,22 +150,13 @@ class Episode:
     description: str = ""
     duration: str = ""
     release_date: str = ""
-    download_links: List[Dict[str, str]] = field(default_factory=list)
+    # Rarement rempli: tuple vide partagé plutôt qu'une liste par épisode
+    download_links: Tuple[Dict[str, str], ...] = ()
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "number": self.number,
-            "title": self.title,
-            "id": self.id,
-            "sources": [s.to_dict() for s in self.sources],
-            "thumbnail": self.thumbnail,
-            "description": self.description,
-            "duration": self.duration,
-            "release_date": self.release_date,
-            "download_links": self.download_links,
-        }
+        return {name: _to_plain(getattr(self, name)) for name in self._FIELD_NAMES}
 
-@dataclass
+@dataclass(slots=True)
 class Season:
     """Représente une saison"""
     number: int
@@ -93,15 +166,11 @@ class Season:
     episode_count: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "number": self.number,
-            "title": self.title,
-            "id": self.id,
-            "episodes": [e.to_dict() for e in self.episodes],
-            "episode_count": len(self.episodes) or self.episode_count,
-        }
+        result = {name: _to_plain(getattr(self, name)) for name in self._FIELD_NAMES}
+        result["episode_count"] = len(result["episodes"]) or self.episode_count
+        return result
 
-@dataclass
+@dataclass(slots=True)
 class ScraperResult:
     """Résultat complet d'un scrap"""
     title: str
@@ -142,60 +211,97 @@ class ScraperResult:
     # Source
     source_site: str = ""
     source_url: str = ""
-    scraped_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Horodatage UTC fixé à la première sérialisation (évite un datetime par instance)
+    scraped_at: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        result = {
-            "title": self.title,
-            "original_title": self.original_title,
-            "id": self.id,
-            "type": self.type,
-            "description": self.description,
-            "poster": self.poster,
-            "banner": self.banner,
-            "rating": self.rating,
-            "release_year": self.release_year,
-            "genres": self.genres,
-            "status": self.status,
-            "duration": self.duration,
-            "country": self.country,
-            "language": self.language,
-            "episode_count": len(self.episodes) if self.episodes else self.episode_count,
-            "episodes": [e.to_dict() for e in self.episodes],
-            "season_count": len(self.seasons) if self.seasons else self.season_count,
-            "seasons": [s.to_dict() for s in self.seasons],
-            "sources": [s.to_dict() for s in self.sources],
-            "alternative_titles": self.alternative_titles,
-            "cast": self.cast,
-            "director": self.director,
-            "studio": self.studio,
-            "download_links": self.download_links,
-            "source_site": self.source_site,
-            "source_url": self.source_url,
-            "scraped_at": self.scraped_at,
-        }
+        if self.scraped_at is None:
+            self.scraped_at = datetime.now(timezone.utc).isoformat()
+        result = {name: _to_plain(getattr(self, name)) for name in self._FIELD_NAMES}
+        # Compteurs tirés des listes déjà converties, sans relire les attributs
+        result["episode_count"] = len(result["episodes"]) or self.episode_count
+        result["season_count"] = len(result["seasons"]) or self.season_count
         return result
     
+    def _sync_computed_fields(self):
+        """Aligne sur l'objet les champs que to_dict calcule, avant un encodage orjson direct"""
+        if self.episodes:
+            self.episode_count = len(self.episodes)
+        if self.seasons:
+            self.season_count = len(self.seasons)
+        for season in self.seasons:
+            if season.episodes:
+                season.episode_count = len(season.episodes)
+        if self.scraped_at is None:
+            self.scraped_at = datetime.now(timezone.utc).isoformat()
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        JSON compact, identique à to_dict, sans construire le dict intermédiaire
+        
+        orjson parcourt lui-même les dataclasses et les Enum en C.
+        """
+        self._sync_computed_fields()
+        return orjson.dumps(self)
+    
     def to_json(self, indent: int = 2) -> str:
+        # orjson ne sait indenter que sur 2 espaces: json pour les autres cas
+        if indent == 2:
+            self._sync_computed_fields()
+            return orjson.dumps(self, option=orjson.OPT_INDENT_2).decode()
+        if not indent:
+            return self.to_json_bytes().decode()
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
 
+# Noms des champs calculés une seule fois par classe, parcourus par to_dict
+_DATACLASS_TYPES = frozenset({VideoSource, Episode, Season, ScraperResult})
+for _cls in _DATACLASS_TYPES:
+    _cls._FIELD_NAMES = tuple(f.name for f in fields(_cls) if not f.name.startswith('_'))
+del _cls
+
+@lru_cache(maxsize=4096)
+def _title_id(title: str) -> str:
+    """Empreinte BLAKE2b de 6 octets: exactement 12 caractères hexadécimaux"""
+    return hashlib.blake2b(title.encode('utf-8'), digest_size=6).hexdigest()
+
+# Headers communs à tous les scrapers, partagés plutôt que recopiés par instance
+_DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+})
+
 class BaseScraper(ABC):
-    """Classe de base pour tous les scrapers"""
+    """
+    Classe de base pour tous les scrapers
+    
+    Les requêtes HTTP passent par la session partagée (voir _get_session, ou
+    fetch_page/fetch_json de utils qui l'utilisent): ne pas ouvrir de
+    ClientSession par appel. Utilisable en `async with Scraper() as s:`.
+    """
+    
+    # Requêtes simultanées au plus vers le site d'un scraper: les fan-out
+    # (saisons, serveurs...) ne partent pas en rafale sur le même hôte
+    max_inflight_requests = 16
     
-    def __init__(self, base_url: str, site_name: str, language: str = "en"):
+    def __init__(self, base_url: str, site_name: str, language: str = "en",
+                 headers: Optional[Mapping[str, str]] = None):
         self.base_url = base_url.rstrip('/')
         self.site_name = site_name
         self.language = language
+        # Session HTTP partagée, assignée au démarrage de l'API (voir _get_session)
         self.session = None
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-        }
+        # Créé au premier appel, dans la boucle d'événements qui l'utilise
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        # Requêtes en cours, partagées entre les appels concurrents identiques
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        # Headers par défaut partagés (lecture seule); une copie seulement si
+        # le scraper en surcharge
+        self.headers: Mapping[str, str] = {**_DEFAULT_HEADERS, **headers} if headers else _DEFAULT_HEADERS
     
     @abstractmethod
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -251,29 +357,127 @@ class BaseScraper(ABC):
         """
         return []
     
+    async def _run_bounded(self, coro_fn, args_list, concurrency: int) -> List[Any]:
+        """Exécute coro_fn(*args) pour chaque args en parallèle, au plus `concurrency` à la fois"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_one(args):
+            async with semaphore:
+                return await coro_fn(*args)
+        
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(run_one(args)) for args in args_list]
+        return [task.result() for task in tasks]
+    
+    async def search_many(self, queries: List[str], limit: int = 10,
+                          concurrency: int = 20) -> List[List[Dict[str, Any]]]:
+        """Plusieurs recherches en parallèle; résultats dans l'ordre des requêtes"""
+        return await self._run_bounded(self.search, [(query, limit) for query in queries], concurrency)
+    
+    async def get_details_many(self, content_ids: List[str],
+                               concurrency: int = 20) -> List[Optional[ScraperResult]]:
+        """Détails de plusieurs contenus en parallèle, dans l'ordre des identifiants"""
+        return await self._run_bounded(self.get_details, [(content_id,) for content_id in content_ids], concurrency)
+    
+    async def get_episode_sources_many(self, content_id: str, episode_ids: List[str],
+                                       concurrency: int = 20) -> List[List[VideoSource]]:
+        """Sources de plusieurs épisodes d'un même contenu en parallèle"""
+        return await self._run_bounded(
+            self.get_episode_sources, [(content_id, episode_id) for episode_id in episode_ids], concurrency
+        )
+    
+    async def _get_session(self):
+        """Session HTTP partagée par tous les scrapers, pour un accès direct à aiohttp"""
+        if self.session is None or self.session.closed:
+            from .utils import get_shared_session
+            self.session = get_shared_session()
+        return self.session
+    
+    def _get_request_slots(self) -> asyncio.Semaphore:
+        """Sémaphore bornant les requêtes en vol de ce scraper"""
+        if self._request_slots is None:
+            self._request_slots = asyncio.Semaphore(self.max_inflight_requests)
+        return self._request_slots
+    
+    async def _bounded_fetch(self, fetch, url: str):
+        """Appelle un helper fetch_* de utils avec les headers du scraper, dans la limite de requêtes en vol"""
+        async with self._get_request_slots():
+            return await fetch(url, self.headers, session=await self._get_session())
+    
+    def _request_done(self, key: tuple, task: asyncio.Task):
+        """Retire la requête terminée de la table des requêtes en cours"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    def _shared_fetch(self, fetch, url: str):
+        """
+        Requête partagée entre appels concurrents identiques (même helper, même URL)
+        
+        Le second appelant attend la requête du premier au lieu d'en émettre une
+        autre. Le résultat est donc partagé: les appelants ne le modifient pas.
+        """
+        key = (fetch, url)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._bounded_fetch(fetch, url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._request_done(key, t))
+        # shield: l'annulation d'un appelant n'annule pas la requête partagée
+        return asyncio.shield(task)
+    
+    async def _fetch_page(self, url: str) -> Optional[str]:
+        """fetch_page avec les headers du scraper (voir _shared_fetch)"""
+        from .utils import fetch_page
+        return await self._shared_fetch(fetch_page, url)
+    
+    async def _fetch_page_bytes(self, url: str) -> Optional[bytes]:
+        """fetch_page_bytes (octets bruts pour parse_html), voir _shared_fetch"""
+        from .utils import fetch_page_bytes
+        return await self._shared_fetch(fetch_page_bytes, url)
+    
+    async def _fetch_tree(self, url: str):
+        """fetch_tree (page parsée en flux), voir _shared_fetch"""
+        from .utils import fetch_tree
+        return await self._shared_fetch(fetch_tree, url)
+    
+    async def _fetch_json(self, url: str) -> Optional[Any]:
+        """fetch_json avec les headers du scraper (voir _shared_fetch)"""
+        from .utils import fetch_json
+        return await self._shared_fetch(fetch_json, url)
+    
+    async def close(self):
+        """Libère la session du scraper (la session partagée reste ouverte pour les autres)"""
+        self.session = None
+    
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
     def generate_id(self, title: str) -> str:
         """Génère un ID unique basé sur le titre"""
-        return hashlib.md5(title.encode()).hexdigest()[:12]
+        return _title_id(title)
     
     def clean_text(self, text: str) -> str:
         """Nettoie le texte extrait"""
         if not text:
             return ""
-        return ' '.join(text.replace('\n', ' ').replace('\t', ' ').split())
+        return _WHITESPACE_RE.sub(' ', text).strip()
     
     def extract_year(self, text: str) -> str:
         """Extrait l'année d'une chaîne"""
-        import re
-        match = re.search(r'\b(19|20)\d{2}\b', text)
+        match = _YEAR_RE.search(text)
         return match.group(0) if match else ""
     
     def parse_duration(self, text: str) -> str:
         """Parse la durée en minutes"""
-        import re
-        match = re.search(r'(\d+)\s*min', text.lower())
+        text_lower = text.lower()
+        match = _DURATION_MIN_RE.search(text_lower)
         if match:
             return f"{match.group(1)} min"
-        match = re.search(r'(\d+)\s*h', text.lower())
+        match = _DURATION_HOURS_RE.search(text_lower)
         if match:
             return f"{match.group(1)}h"
         return text
@@ -281,16 +485,33 @@ class BaseScraper(ABC):
     def get_quality_from_text(self, text: str) -> VideoQuality:
         """Déduit la qualité vidéo du texte"""
         text_lower = text.lower()
-        if '4k' in text_lower or '2160p' in text_lower:
-            return VideoQuality.UHD_4K
-        elif '1440p' in text_lower or '2k' in text_lower:
-            return VideoQuality.FHD_1440P
-        elif '1080p' in text_lower or 'full hd' in text_lower or 'fhd' in text_lower:
-            return VideoQuality.HD_1080P
-        elif '720p' in text_lower or 'hd' in text_lower:
-            return VideoQuality.HD_720P
-        elif '480p' in text_lower:
-            return VideoQuality.SD_480P
-        elif '360p' in text_lower:
-            return VideoQuality.SD_360P
-        return VideoQuality.UNKNOWN
+        # Libellé réduit à un seul jeton ("1080p", "HD"...), le cas le plus
+        # courant: une lookup de dict au lieu du parcours regex
+        quality = _QUALITY_TOKENS.get(text_lower.strip())
+        if quality is not None:
+            return quality
+        tokens = _QUALITY_RE.findall(text_lower)
+        if not tokens:
+            return VideoQuality.UNKNOWN
+        return min((_QUALITY_TOKENS[token] for token in tokens), key=_QUALITY_RANK.__getitem__)
+    
+    def get_qualities_from_texts(self, texts: List[str]) -> List[VideoQuality]:
+        """
+        get_quality_from_text sur une série de libellés, en un seul parcours regex
+        
+        Les libellés sont joints par un séparateur; chaque jeton trouvé est
+        rattaché à son libellé d'origine par sa position.
+        """
+        # Minuscules libellé par libellé: lower() peut changer la longueur
+        lowered = [text.lower() for text in texts]
+        joined = '\x00'.join(lowered)
+        # Position de fin de chaque libellé dans la chaîne jointe
+        ends = list(accumulate(len(text) + 1 for text in lowered))
+        results = [VideoQuality.UNKNOWN] * len(texts)
+        for match in _QUALITY_RE.finditer(joined):
+            index = bisect.bisect_right(ends, match.start())
+            quality = _QUALITY_TOKENS[match.group(0)]
+            current = results[index]
+            if current is VideoQuality.UNKNOWN or _QUALITY_RANK[quality] < _QUALITY_RANK[current]:
+                results[index] = quality
+        return results
@@ -3,14 +3,74 @@ Scrapers pour sites de films et séries
 """
 
 import re
-import json
+import asyncio
 from typing import List, Dict, Optional, Any
 from urllib.parse import urljoin, quote
-from bs4 import BeautifulSoup
-import aiohttp
+from lxml import etree
 
 from .base_scraper import BaseScraper, ScraperResult, Episode, Season, VideoSource, VideoQuality, SourceType
-from .utils import fetch_page, fetch_json, bypass_cloudflare, get_random_headers
+from .utils import (
+    bypass_cloudflare_async, parse_html, has_class, node_text, first_node, id_from_href,
+    async_ttl_cache, SOURCE_LINKS_TTL
+)
+
+# Année et durée extraites en un seul passage sur le bloc d'infos
+_META_RE = re.compile(r'(?P<dur>\d+)\s*min|(?P<year>\d{4})', re.I)
+
+# Marqueurs du bloc titre, cherchés dans le HTML brut avant tout parsing
+_SFLIX_TITLE_MARKER = 'film-name'
+_FMOVIES_TITLE_MARKER = '<h1'
+
+# Sélecteurs XPath compilés une seule fois (équivalents des find/find_all BeautifulSoup)
+_FIRST_IMG_XPATH = etree.XPath('(.//img)[1]')
+_GENRE_LINKS_XPATH = etree.XPath('.//a[contains(@href, "/genre/")]')
+_IFRAME_XPATH = etree.XPath('.//iframe')
+
+_SFLIX_ITEMS_XPATH = etree.XPath(f'//div[{has_class("flw-item")}]')
+_SFLIX_LINK_XPATH = etree.XPath(f'(.//a[{has_class("film-poster-ahref")}])[1]')
+_SFLIX_TITLE_XPATH = etree.XPath(f'(.//h2[{has_class("film-name")}])[1]')
+_SFLIX_DESCRIPTION_XPATH = etree.XPath(f'(//div[{has_class("film-description")}])[1]')
+_SFLIX_POSTER_XPATH = etree.XPath(f'(//img[{has_class("film-poster-img")}])[1]')
+_SFLIX_INFO_XPATH = etree.XPath(f'(//div[{has_class("elements")}])[1]')
+_SFLIX_SEASONS_XPATH = etree.XPath(f'//a[{has_class("dropdown-item")}]')
+_SFLIX_EPISODES_XPATH = etree.XPath(f'//a[{has_class("episode-item")}]')
+_SFLIX_EPISODE_NUMBER_XPATH = etree.XPath(f'(.//span[{has_class("episode-number")}])[1]')
+_SFLIX_SERVER_IDS_XPATH = etree.XPath(f'//a[{has_class("server-item")}]/@data-id', smart_strings=False)
+
+_FMOVIES_ITEMS_XPATH = etree.XPath(f'//div[{has_class("item")}]')
+_FMOVIES_LINK_XPATH = etree.XPath(f'(.//a[{has_class("poster")}])[1]')
+_FMOVIES_TITLE_XPATH = etree.XPath(f'(//h1[{has_class("title")}])[1]')
+_FMOVIES_DESCRIPTION_XPATH = etree.XPath(f'(//div[{has_class("desc")}])[1]')
+_FMOVIES_POSTER_XPATH = etree.XPath(f'(//img[{has_class("poster")}])[1]')
+_FMOVIES_META_XPATH = etree.XPath(f'(//div[{has_class("meta")}])[1]')
+_FMOVIES_SEASON_OPTIONS_XPATH = etree.XPath('(//select[@id="season"])[1]//option')
+_FMOVIES_EPISODES_XPATH = etree.XPath(f'//a[{has_class("episode")}]')
+_FMOVIES_WATCH_XPATH = etree.XPath(f'(//div[{has_class("watch")}])[1]')
+
+def _api_episodes(episodes_data: List[Dict[str, Any]], number_key: str) -> List[Episode]:
+    """Épisodes d'une réponse d'API JSON (le titre par défaut n'est formaté que s'il manque)"""
+    return [
+        Episode(
+            number=ep.get(number_key, 0),
+            title=ep['title'] if 'title' in ep else f"Episode {ep.get(number_key, 0)}",
+            id=str(ep.get('id', ''))
+        )
+        for ep in episodes_data
+    ]
+
+def _parse_meta(text: str):
+    """Retourne (année, durée) depuis le texte d'infos d'une fiche"""
+    year = ""
+    duration = ""
+    for match in _META_RE.finditer(text):
+        if match.group('dur'):
+            if not duration:
+                duration = f"{match.group('dur')} min"
+        elif not year:
+            year = match.group('year')
+        if year and duration:
+            break
+    return year, duration
 
 class SFlixScraper(BaseScraper):
     """Scraper pour SFlix"""
@@ -22,25 +82,23 @@ class SFlixScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur SFlix"""
         search_url = f"{self.base_url}/search/{quote(query)}"
-        html = await fetch_page(search_url, self.headers)
+        html = await self._fetch_page_bytes(search_url)
         
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'lxml')
+        tree = parse_html(html)
         results = []
         
-        items = soup.find_all('div', class_='flw-item')
-        
-        for item in items[:limit]:
-            link = item.find('a', class_='film-poster-ahref')
-            img = item.find('img')
-            title_elem = item.find('h2', class_='film-name')
+        for item in _SFLIX_ITEMS_XPATH(tree)[:limit]:
+            link = first_node(_SFLIX_LINK_XPATH, item)
+            img = first_node(_FIRST_IMG_XPATH, item)
+            title_elem = first_node(_SFLIX_TITLE_XPATH, item)
             
-            if link:
+            if link is not None:
                 href = link.get('href', '')
-                title = title_elem.get_text(strip=True) if title_elem else (img.get('alt', '') if img else '')
-                content_id = href.split('/')[-1].split('?')[0] if '/' in href else href
+                title = node_text(title_elem) if title_elem is not None else (img.get('alt', '') if img is not None else '')
+                content_id = id_from_href(href)
                 
                 # Déterminer le type
                 content_type = 'movie' if '/movie/' in href else 'series'
@@ -49,61 +107,54 @@ class SFlixScraper(BaseScraper):
                     'id': content_id,
                     'title': title,
                     'url': urljoin(self.base_url, href),
-                    'poster': img.get('data-src', img.get('src', '')) if img else '',
+                    'poster': img.get('data-src', img.get('src', '')) if img is not None else '',
                     'type': content_type,
                     'source': self.site_name
                 })
         
         return results
     
+    # Les détails d'un film incluent ses sources: TTL court
+    @async_ttl_cache(ttl=SOURCE_LINKS_TTL)
     async def get_details(self, content_id: str, content_type: str = "movie") -> Optional[ScraperResult]:
         """Récupère les détails"""
         detail_url = f"{self.base_url}/{content_type}/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        tree = await self._fetch_tree(detail_url)
         
-        if not html:
-            html = bypass_cloudflare(detail_url, self.headers)
-            if not html:
+        if tree is None:
+            html = await bypass_cloudflare_async(detail_url, self.headers)
+            # Page de challenge ou d'erreur: pas la peine de la parser
+            if not html or _SFLIX_TITLE_MARKER not in html:
                 return None
+            tree = parse_html(html)
         
-        soup = BeautifulSoup(html, 'lxml')
-        
-        # Titre
-        title = ""
-        title_elem = soup.find('h2', class_='film-name')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
+        # Titre (sans lui la page est inexploitable: on évite les appels ajax qui suivent)
+        title_elem = first_node(_SFLIX_TITLE_XPATH, tree)
+        if title_elem is None:
+            return None
+        title = node_text(title_elem)
         
         # Description
         description = ""
-        desc_div = soup.find('div', class_='film-description')
-        if desc_div:
-            description = desc_div.get_text(strip=True)
+        desc_div = first_node(_SFLIX_DESCRIPTION_XPATH, tree)
+        if desc_div is not None:
+            description = node_text(desc_div)
         
         # Poster
         poster = ""
-        img = soup.find('img', class_='film-poster-img')
-        if img:
+        img = first_node(_SFLIX_POSTER_XPATH, tree)
+        if img is not None:
             poster = img.get('data-src', img.get('src', ''))
         
-        # Genres
-        genres = []
-        genre_links = soup.find_all('a', href=re.compile(r'/genre/'))
-        for link in genre_links:
-            genres.append(link.get_text(strip=True))
+        # Genres (dédoublonnés en conservant l'ordre de la page)
+        genres = list(dict.fromkeys(node_text(link) for link in _GENRE_LINKS_XPATH(tree)))
         
         # Infos
-        info_div = soup.find('div', class_='elements')
+        info_div = first_node(_SFLIX_INFO_XPATH, tree)
         year = ""
         duration = ""
-        if info_div:
-            text = info_div.get_text()
-            year_match = re.search(r'(\d{4})', text)
-            if year_match:
-                year = year_match.group(1)
-            duration_match = re.search(r'(\d+)\s*min', text, re.I)
-            if duration_match:
-                duration = f"{duration_match.group(1)} min"
+        if info_div is not None:
+            year, duration = _parse_meta(info_div.text_content())
         
         result = ScraperResult(
             title=title,
@@ -113,7 +164,7 @@ class SFlixScraper(BaseScraper):
             poster=poster,
             release_year=year,
             duration=duration,
-            genres=list(set(genres)),
+            genres=genres,
             source_site=self.site_name,
             source_url=detail_url
         )
@@ -128,27 +179,26 @@ class SFlixScraper(BaseScraper):
         
         return result
     
+    @async_ttl_cache()
     async def _get_seasons(self, series_id: str) -> List[Season]:
         """Récupère les saisons d'une série"""
         seasons = []
         
         # API pour les saisons
-        seasons_url = f"{self.api_url}/season/list/{series_id}"
-        data = await fetch_json(seasons_url, self.headers)
+        seasons_tree = await self._fetch_fragment(f"{self.api_url}/season/list/{series_id}")
         
-        if data and 'data' in data:
-            seasons_html = data['data']
-            soup = BeautifulSoup(seasons_html, 'lxml')
+        if seasons_tree is not None:
+            season_items = [
+                (node_text(season_item), season_item.get('data-id', ''))
+                for season_item in _SFLIX_SEASONS_XPATH(seasons_tree)
+            ]
             
-            season_items = soup.find_all('a', class_='dropdown-item')
+            # Récupérer les épisodes de toutes les saisons en parallèle
+            episodes_lists = await asyncio.gather(*(
+                self._get_episodes(series_id, season_data_id) for _, season_data_id in season_items
+            ))
             
-            for i, season_item in enumerate(season_items, 1):
-                season_title = season_item.get_text(strip=True)
-                season_data_id = season_item.get('data-id', '')
-                
-                # Récupérer les épisodes de cette saison
-                episodes = await self._get_episodes(series_id, season_data_id)
-                
+            for i, ((season_title, season_data_id), episodes) in enumerate(zip(season_items, episodes_lists), 1):
                 seasons.append(Season(
                     number=i,
                     title=season_title,
@@ -159,24 +209,19 @@ class SFlixScraper(BaseScraper):
         
         return seasons
     
+    @async_ttl_cache()
     async def _get_episodes(self, series_id: str, season_id: str) -> List[Episode]:
         """Récupère les épisodes d'une saison"""
         episodes = []
         
-        episodes_url = f"{self.api_url}/season/episodes/{season_id}"
-        data = await fetch_json(episodes_url, self.headers)
+        episodes_tree = await self._fetch_fragment(f"{self.api_url}/season/episodes/{season_id}")
         
-        if data and 'data' in data:
-            episodes_html = data['data']
-            soup = BeautifulSoup(episodes_html, 'lxml')
-            
-            ep_items = soup.find_all('a', class_='episode-item')
-            
-            for ep in ep_items:
+        if episodes_tree is not None:
+            for ep in _SFLIX_EPISODES_XPATH(episodes_tree):
                 ep_title = ep.get('title', '')
                 ep_data_id = ep.get('data-id', '')
-                ep_number = ep.find('span', class_='episode-number')
-                ep_num = int(ep_number.get_text(strip=True)) if ep_number else 0
+                ep_number = first_node(_SFLIX_EPISODE_NUMBER_XPATH, ep)
+                ep_num = int(node_text(ep_number)) if ep_number is not None else 0
                 
                 episodes.append(Episode(
                     number=ep_num,
@@ -186,70 +231,43 @@ class SFlixScraper(BaseScraper):
         
         return episodes
     
+    async def _fetch_fragment(self, url: str):
+        """Arbre lxml du fragment HTML renvoyé par l'API ajax ({"data": "<html>"}), ou None"""
+        data = await self._fetch_json(url)
+        if data and 'data' in data:
+            return parse_html(data['data'])
+        return None
+    
     async def _get_movie_sources(self, movie_id: str) -> List[VideoSource]:
         """Récupère les sources d'un film"""
-        sources = []
-        
-        # Récupérer les serveurs
-        servers_url = f"{self.api_url}/movie/servers/{movie_id}"
-        data = await fetch_json(servers_url, self.headers)
-        
-        if data and 'data' in data:
-            servers_html = data['data']
-            soup = BeautifulSoup(servers_html, 'lxml')
-            
-            server_items = soup.find_all('a', class_='server-item')
-            
-            for server in server_items:
-                server_id = server.get('data-id', '')
-                server_name = server.get('data-server', '')
-                
-                # Récupérer la source
-                source_url = f"{self.api_url}/movie/sources/{server_id}"
-                source_data = await fetch_json(source_url, self.headers)
-                
-                if source_data and 'data' in source_data:
-                    for src in source_data['data']:
-                        link = src.get('link', '')
-                        if link:
-                            sources.append(VideoSource(
-                                url=link,
-                                type=SourceType.HLS if '.m3u8' in link else SourceType.DIRECT,
-                                is_m3u8='.m3u8' in link,
-                                referer=self.base_url
-                            ))
-        
-        return sources
+        return await self._get_server_sources("movie", movie_id)
     
     async def get_episode_sources(self, content_id: str, episode_id: str) -> List[VideoSource]:
         """Récupère les sources d'un épisode"""
+        return await self._get_server_sources("episode", episode_id)
+    
+    async def _get_server_sources(self, kind: str, item_id: str) -> List[VideoSource]:
+        """Sources de tous les serveurs d'un film ou d'un épisode (kind: movie/episode)"""
         sources = []
         
-        # Récupérer les serveurs pour l'épisode
-        servers_url = f"{self.api_url}/episode/servers/{episode_id}"
-        data = await fetch_json(servers_url, self.headers)
+        # Récupérer les serveurs
+        servers_tree = await self._fetch_fragment(f"{self.api_url}/{kind}/servers/{item_id}")
         
-        if data and 'data' in data:
-            servers_html = data['data']
-            soup = BeautifulSoup(servers_html, 'lxml')
+        if servers_tree is not None:
+            server_ids = _SFLIX_SERVER_IDS_XPATH(servers_tree)
             
-            server_items = soup.find_all('a', class_='server-item')
-            
-            for server in server_items:
-                server_id = server.get('data-id', '')
-                
-                # Récupérer la source
-                source_url = f"{self.api_url}/episode/sources/{server_id}"
-                source_data = await fetch_json(source_url, self.headers)
-                
+            # Récupérer la source de chaque serveur, en parallèle
+            source_urls = [f"{self.api_url}/{kind}/sources/{server_id}" for server_id in server_ids]
+            for source_data in await asyncio.gather(*(self._fetch_json(url) for url in source_urls)):
                 if source_data and 'data' in source_data:
                     for src in source_data['data']:
                         link = src.get('link', '')
                         if link:
+                            is_hls = '.m3u8' in link
                             sources.append(VideoSource(
                                 url=link,
-                                type=SourceType.HLS if '.m3u8' in link else SourceType.DIRECT,
-                                is_m3u8='.m3u8' in link,
+                                type=SourceType.HLS if is_hls else SourceType.DIRECT,
+                                is_m3u8=is_hls,
                                 referer=self.base_url
                             ))
         
@@ -264,28 +282,26 @@ class FMoviesScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur FMovies"""
         search_url = f"{self.base_url}/search?keyword={quote(query)}"
-        html = await fetch_page(search_url, self.headers)
+        html = await self._fetch_page_bytes(search_url)
         
         if not html:
-            html = bypass_cloudflare(search_url, self.headers)
+            html = await bypass_cloudflare_async(search_url, self.headers)
         
         if not html:
             return []
         
-        soup = BeautifulSoup(html, 'lxml')
+        tree = parse_html(html)
         results = []
         
-        items = soup.find_all('div', class_='item')
-        
-        for item in items[:limit]:
-            link = item.find('a', class_='poster')
-            if link:
+        for item in _FMOVIES_ITEMS_XPATH(tree)[:limit]:
+            link = first_node(_FMOVIES_LINK_XPATH, item)
+            if link is not None:
                 href = link.get('href', '')
                 title = link.get('title', '')
-                content_id = href.split('/')[-1].split('?')[0] if '/' in href else href
+                content_id = id_from_href(href)
                 
-                img = link.find('img')
-                poster = img.get('src', '') if img else ''
+                img = first_node(_FIRST_IMG_XPATH, link)
+                poster = img.get('src', '') if img is not None else ''
                 
                 content_type = 'movie' if '/movie/' in href else 'series'
                 
@@ -300,54 +316,49 @@ class FMoviesScraper(BaseScraper):
         
         return results
     
+    # Les détails d'un film incluent ses sources: TTL court
+    @async_ttl_cache(ttl=SOURCE_LINKS_TTL)
     async def get_details(self, content_id: str, content_type: str = "movie") -> Optional[ScraperResult]:
         """Récupère les détails"""
         detail_url = f"{self.base_url}/{content_type}/{content_id}"
-        html = await fetch_page(detail_url, self.headers)
+        tree = await self._fetch_tree(detail_url)
         
-        if not html:
-            html = bypass_cloudflare(detail_url, self.headers)
-            if not html:
+        if tree is None:
+            html = await bypass_cloudflare_async(detail_url, self.headers)
+            # Page de challenge ou d'erreur: pas la peine de la parser
+            if not html or _FMOVIES_TITLE_MARKER not in html:
                 return None
+            tree = parse_html(html)
         
-        soup = BeautifulSoup(html, 'lxml')
-        
-        # Titre
-        title = ""
-        title_elem = soup.find('h1', class_='title')
-        if title_elem:
-            title = title_elem.get_text(strip=True)
+        # Titre (sans lui la page est inexploitable: on évite les appels ajax qui suivent)
+        title_elem = first_node(_FMOVIES_TITLE_XPATH, tree)
+        if title_elem is None:
+            return None
+        title = node_text(title_elem)
         
         # Description
         description = ""
-        desc_div = soup.find('div', class_='desc')
-        if desc_div:
-            description = desc_div.get_text(strip=True)
+        desc_div = first_node(_FMOVIES_DESCRIPTION_XPATH, tree)
+        if desc_div is not None:
+            description = node_text(desc_div)
         
         # Poster
         poster = ""
-        img = soup.find('img', class_='poster')
-        if img:
+        img = first_node(_FMOVIES_POSTER_XPATH, tree)
+        if img is not None:
             poster = img.get('src', '')
         
-        # Genres
+        # Genres (dédoublonnés en conservant l'ordre de la page)
         genres = []
-        meta_div = soup.find('div', class_='meta')
-        if meta_div:
-            for link in meta_div.find_all('a', href=re.compile(r'/genre/')):
-                genres.append(link.get_text(strip=True))
+        meta_div = first_node(_FMOVIES_META_XPATH, tree)
+        if meta_div is not None:
+            genres = list(dict.fromkeys(node_text(link) for link in _GENRE_LINKS_XPATH(meta_div)))
         
         # Infos
         year = ""
         duration = ""
-        if meta_div:
-            text = meta_div.get_text()
-            year_match = re.search(r'(\d{4})', text)
-            if year_match:
-                year = year_match.group(1)
-            duration_match = re.search(r'(\d+)\s*min', text, re.I)
-            if duration_match:
-                duration = f"{duration_match.group(1)} min"
+        if meta_div is not None:
+            year, duration = _parse_meta(meta_div.text_content())
         
         result = ScraperResult(
             title=title,
@@ -357,34 +368,36 @@ class FMoviesScraper(BaseScraper):
             poster=poster,
             release_year=year,
             duration=duration,
-            genres=list(set(genres)),
+            genres=genres,
             source_site=self.site_name,
             source_url=detail_url
         )
         
         if content_type == "series":
-            result.seasons = await self._get_seasons(soup, content_id)
+            result.seasons = await self._get_seasons(tree, content_id)
             result.season_count = len(result.seasons)
         else:
-            result.sources = await self._get_movie_sources(soup, content_id)
+            result.sources = await self._get_movie_sources(tree, content_id)
         
         return result
     
-    async def _get_seasons(self, soup: BeautifulSoup, series_id: str) -> List[Season]:
+    async def _get_seasons(self, tree, series_id: str) -> List[Season]:
         """Récupère les saisons"""
         seasons = []
         
         # Chercher les options de saison
-        season_select = soup.find('select', {'id': 'season'})
-        if season_select:
-            options = season_select.find_all('option')
-            for opt in options:
-                season_num = opt.get('value', '')
-                season_title = opt.get_text(strip=True)
-                
-                # Récupérer les épisodes
-                episodes = await self._get_episodes(series_id, season_num)
-                
+        options = [
+            (opt.get('value', ''), node_text(opt))
+            for opt in _FMOVIES_SEASON_OPTIONS_XPATH(tree)
+        ]
+        if options:
+            
+            # Récupérer les épisodes de toutes les saisons en parallèle
+            episodes_lists = await asyncio.gather(*(
+                self._get_episodes(series_id, season_num) for season_num, _ in options
+            ))
+            
+            for (season_num, season_title), episodes in zip(options, episodes_lists):
                 seasons.append(Season(
                     number=int(season_num) if season_num.isdigit() else 0,
                     title=season_title,
@@ -395,19 +408,17 @@ class FMoviesScraper(BaseScraper):
         
         return seasons
     
+    @async_ttl_cache()
     async def _get_episodes(self, series_id: str, season_num: str) -> List[Episode]:
         """Récupère les épisodes"""
         episodes = []
         
         # L'URL change avec la saison
         url = f"{self.base_url}/ajax/season/episodes/{series_id}?season={season_num}"
-        data = await fetch_page(url, self.headers)
+        data = await self._fetch_page_bytes(url)
         
         if data:
-            soup = BeautifulSoup(data, 'lxml')
-            ep_items = soup.find_all('a', class_='episode')
-            
-            for ep in ep_items:
+            for ep in _FMOVIES_EPISODES_XPATH(parse_html(data)):
                 ep_num = ep.get('data-num', '')
                 ep_title = ep.get('title', '')
                 ep_id = ep.get('data-id', '')
@@ -420,15 +431,14 @@ class FMoviesScraper(BaseScraper):
         
         return episodes
     
-    async def _get_movie_sources(self, soup: BeautifulSoup, movie_id: str) -> List[VideoSource]:
+    async def _get_movie_sources(self, tree, movie_id: str) -> List[VideoSource]:
         """Récupère les sources d'un film"""
         sources = []
         
         # Chercher les iframes ou les liens directs
-        watch_div = soup.find('div', class_='watch')
-        if watch_div:
-            iframes = watch_div.find_all('iframe')
-            for iframe in iframes:
+        watch_div = first_node(_FMOVIES_WATCH_XPATH, tree)
+        if watch_div is not None:
+            for iframe in _IFRAME_XPATH(watch_div):
                 src = iframe.get('src', '')
                 if src:
                     if src.startswith('//'):
@@ -446,7 +456,7 @@ class FMoviesScraper(BaseScraper):
         sources = []
         
         url = f"{self.base_url}/ajax/episode/sources/{episode_id}"
-        data = await fetch_json(url, self.headers)
+        data = await self._fetch_json(url)
         
         if data and 'data' in data:
             for src in data['data']:
@@ -468,41 +478,42 @@ class LookMovieScraper(BaseScraper):
     
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur LookMovie"""
+        # Films et séries: deux recherches indépendantes, lancées ensemble
         search_url = f"{self.base_url}/api/v1/movies/search/?q={quote(query)}"
-        data = await fetch_json(search_url, self.headers)
+        series_url = f"{self.base_url}/api/v1/shows/search/?q={quote(query)}"
+        data, series_data = await asyncio.gather(
+            self._fetch_json(search_url),
+            self._fetch_json(series_url)
+        )
         
         results = []
         
         if data and 'results' in data:
-            for item in data['results'][:limit]:
-                results.append({
-                    'id': str(item.get('id', '')),
-                    'title': item.get('title', ''),
-                    'url': f"{self.base_url}/movies/view/{item.get('slug', '')}",
-                    'poster': item.get('poster', ''),
-                    'year': str(item.get('year', '')),
-                    'type': 'movie',
-                    'source': self.site_name
-                })
-        
-        # Chercher aussi dans les séries
-        series_url = f"{self.base_url}/api/v1/shows/search/?q={quote(query)}"
-        series_data = await fetch_json(series_url, self.headers)
+            results = [self._search_result(item, 'movie', 'movies') for item in data['results'][:limit]]
         
+        # Compléter avec les séries, sans construire celles que la limite écarterait
         if series_data and 'results' in series_data:
-            for item in series_data['results'][:limit]:
-                results.append({
-                    'id': str(item.get('id', '')),
-                    'title': item.get('title', ''),
-                    'url': f"{self.base_url}/shows/view/{item.get('slug', '')}",
-                    'poster': item.get('poster', ''),
-                    'year': str(item.get('year', '')),
-                    'type': 'series',
-                    'source': self.site_name
-                })
+            results += [
+                self._search_result(item, 'series', 'shows')
+                for item in series_data['results'][:limit - len(results)]
+            ]
         
-        return results[:limit]
+        return results
+    
+    def _search_result(self, item: Dict[str, Any], content_type: str, path: str) -> Dict[str, Any]:
+        """Résultat de recherche depuis un élément de l'API (path: movies/shows)"""
+        return {
+            'id': str(item.get('id', '')),
+            'title': item.get('title', ''),
+            'url': f"{self.base_url}/{path}/view/{item.get('slug', '')}",
+            'poster': item.get('poster', ''),
+            'year': str(item.get('year', '')),
+            'type': content_type,
+            'source': self.site_name
+        }
     
+    # Les détails d'un film incluent ses sources: TTL court
+    @async_ttl_cache(ttl=SOURCE_LINKS_TTL)
     async def get_details(self, content_id: str, content_type: str = "movie") -> Optional[ScraperResult]:
         """Récupère les détails"""
         if content_type == "movie":
@@ -513,7 +524,7 @@ class LookMovieScraper(BaseScraper):
     async def _get_movie_details(self, movie_id: str) -> Optional[ScraperResult]:
         """Récupère les détails d'un film"""
         api_url = f"{self.base_url}/api/v1/movies/view/{movie_id}"
-        data = await fetch_json(api_url, self.headers)
+        data = await self._fetch_json(api_url)
         
         if not data:
             return None
@@ -543,7 +554,7 @@ class LookMovieScraper(BaseScraper):
     async def _get_series_details(self, series_id: str) -> Optional[ScraperResult]:
         """Récupère les détails d'une série"""
         api_url = f"{self.base_url}/api/v1/shows/view/{series_id}"
-        data = await fetch_json(api_url, self.headers)
+        data = await self._fetch_json(api_url)
         
         if not data:
             return None
@@ -565,28 +576,17 @@ class LookMovieScraper(BaseScraper):
         )
         
         # Récupérer les saisons
-        seasons_data = series_data.get('seasons', [])
-        seasons = []
-        
-        for season in seasons_data:
-            season_num = season.get('season_number', 0)
-            episodes_data = season.get('episodes', [])
-            episodes = []
-            
-            for ep in episodes_data:
-                episodes.append(Episode(
-                    number=ep.get('episode_number', 0),
-                    title=ep.get('title', f"Episode {ep.get('episode_number', 0)}"),
-                    id=str(ep.get('id', ''))
-                ))
-            
-            seasons.append(Season(
-                number=season_num,
-                title=season.get('title', f"Season {season_num}"),
+        seasons = [
+            Season(
+                number=season.get('season_number', 0),
+                title=season['title'] if 'title' in season else f"Season {season.get('season_number', 0)}",
                 id=str(season.get('id', '')),
                 episodes=episodes,
                 episode_count=len(episodes)
-            ))
+            )
+            for season in series_data.get('seasons', [])
+            for episodes in (_api_episodes(season.get('episodes', []), 'episode_number'),)
+        ]
         
         result.seasons = seasons
         result.season_count = len(seasons)
@@ -600,7 +600,7 @@ class LookMovieScraper(BaseScraper):
         # LookMovie utilise des streams HLS protégés
         # Il faut récupérer le token d'accès
         access_url = f"{self.base_url}/api/v1/{content_type}/access/{content_id}"
-        data = await fetch_json(access_url, self.headers)
+        data = await self._fetch_json(access_url)
         
         if data and 'data' in data:
             streams = data['data'].get('streams', [])
@@ -612,7 +612,7 @@ class LookMovieScraper(BaseScraper):
                     sources.append(VideoSource(
                         url=stream_url,
                         type=SourceType.HLS,
-                        quality=VideoQuality(quality) if quality in [q.value for q in VideoQuality] else VideoQuality.UNKNOWN,
+                        quality=VideoQuality.from_value(quality),
                         is_m3u8=True,
                         referer=self.base_url
                     ))
@@ -632,7 +632,7 @@ class VidSrcScraper(BaseScraper):
     async def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche sur VidSrc"""
         search_url = f"{self.base_url}/api/search/{quote(query)}"
-        data = await fetch_json(search_url, self.headers)
+        data = await self._fetch_json(search_url)
         
         results = []
         
@@ -651,10 +651,12 @@ class VidSrcScraper(BaseScraper):
         
         return results
     
+    # Les détails d'un film incluent ses sources: TTL court
+    @async_ttl_cache(ttl=SOURCE_LINKS_TTL)
     async def get_details(self, content_id: str, content_type: str = "movie") -> Optional[ScraperResult]:
         """Récupère les détails"""
         detail_url = f"{self.base_url}/api/{content_type}/{content_id}"
-        data = await fetch_json(detail_url, self.headers)
+        data = await self._fetch_json(detail_url)
         
         if not data or 'data' not in data:
             return None
@@ -675,28 +677,17 @@ class VidSrcScraper(BaseScraper):
         
         if content_type == "series":
             # Récupérer les saisons et épisodes
-            seasons = []
-            seasons_data = item_data.get('seasons', [])
-            
-            for season in seasons_data:
-                season_num = season.get('number', 1)
-                episodes_data = season.get('episodes', [])
-                episodes = []
-                
-                for ep in episodes_data:
-                    episodes.append(Episode(
-                        number=ep.get('number', 0),
-                        title=ep.get('title', f"Episode {ep.get('number', 0)}"),
-                        id=str(ep.get('id', ''))
-                    ))
-                
-                seasons.append(Season(
-                    number=season_num,
-                    title=f"Season {season_num}",
+            seasons = [
+                Season(
+                    number=season.get('number', 1),
+                    title=f"Season {season.get('number', 1)}",
                     id=str(season.get('id', '')),
                     episodes=episodes,
                     episode_count=len(episodes)
-                ))
+                )
+                for season in item_data.get('seasons', [])
+                for episodes in (_api_episodes(season.get('episodes', []), 'number'),)
+            ]
             
             result.seasons = seasons
             result.season_count = len(seasons)
@@ -704,10 +695,12 @@ class VidSrcScraper(BaseScraper):
             # Sources directes pour les films
             sources_data = item_data.get('sources', [])
             for src in sources_data:
+                url = src.get('url', '')
+                is_hls = '.m3u8' in url
                 result.sources.append(VideoSource(
-                    url=src.get('url', ''),
-                    type=SourceType.HLS if '.m3u8' in src.get('url', '') else SourceType.DIRECT,
-                    is_m3u8='.m3u8' in src.get('url', ''),
+                    url=url,
+                    type=SourceType.HLS if is_hls else SourceType.DIRECT,
+                    is_m3u8=is_hls,
                     referer=self.base_url
                 ))
         
@@ -718,15 +711,17 @@ class VidSrcScraper(BaseScraper):
         sources = []
         
         api_url = f"{self.base_url}/api/episode/{episode_id}"
-        data = await fetch_json(api_url, self.headers)
+        data = await self._fetch_json(api_url)
         
         if data and 'data' in data:
             sources_data = data['data'].get('sources', [])
             for src in sources_data:
+                url = src.get('url', '')
+                is_hls = '.m3u8' in url
                 sources.append(VideoSource(
-                    url=src.get('url', ''),
-                    type=SourceType.HLS if '.m3u8' in src.get('url', '') else SourceType.IFRAME,
-                    is_m3u8='.m3u8' in src.get('url', ''),
+                    url=url,
+                    type=SourceType.HLS if is_hls else SourceType.IFRAME,
+                    is_m3u8=is_hls,
                     referer=self.base_url
                 ))
         
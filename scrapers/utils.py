@@ -3,29 +3,77 @@ Utilitaires pour le scraping
 """
 
 import asyncio
+import atexit
 import re
-import json
+import time
+import random
 import base64
-from typing import Optional, Dict, Any, List
+import binascii
+import functools
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Union
 from urllib.parse import urljoin, urlparse, parse_qs
 import aiohttp
+import orjson
+from cachetools import TTLCache
 from bs4 import BeautifulSoup
-import cloudscraper
+from lxml import etree, html as lxml_html
 import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# User-Agents de navigateurs de bureau courants, tirés à chaque appel de
+# get_random_headers (liste statique: pas de fake_useragent à l'import)
+_USER_AGENTS = (
+    DEFAULT_USER_AGENT,
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14.2; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+)
+
+# Brotli (pages HTML/JS nettement plus petites qu'en gzip) n'est annoncé que si
+# un décodeur est installé: aiohttp et urllib3 s'appuient sur brotli ou brotlicffi.
+# zstd n'est pas proposé, aiohttp 3.9 ne sait pas le décoder.
+try:
+    import brotli  # noqa: F401
+    _HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+
+# Partie fixe des headers, copiée à chaque appel
+_BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+
 def get_random_headers():
-    """Génère des headers aléatoires"""
-    return {
-        "User-Agent": DEFAULT_USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "DNT": "1",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    }
+    """Génère des headers aléatoires (dict neuf, modifiable par l'appelant)"""
+    return {"User-Agent": random.choice(_USER_AGENTS), **_BASE_HEADERS}
+
+# Session requests partagée par les fallbacks synchrones: les connexions
+# keep-alive sont réutilisées au lieu d'ouvrir un pool neuf par requests.get
+_sync_session = requests.Session()
+_sync_session.mount('http://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+_sync_session.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=20))
+atexit.register(_sync_session.close)
 
 def fetch_page_sync(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[str]:
     """Récupère le contenu d'une page (synchrone avec requests)"""
@@ -33,12 +81,12 @@ def fetch_page_sync(url: str, headers: Optional[Dict[str, str]] = None, timeout:
         headers = get_random_headers()
     
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = _sync_session.get(url, headers=headers, timeout=timeout)
         if response.status_code == 200:
             return response.text
         return None
     except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        logger.warning("Error fetching %s: %s", url, e)
         return None
 
 def fetch_json_sync(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[Dict]:
@@ -48,182 +96,593 @@ def fetch_json_sync(url: str, headers: Optional[Dict[str, str]] = None, timeout:
         headers["Accept"] = "application/json"
     
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = _sync_session.get(url, headers=headers, timeout=timeout)
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
+        return None
+    except orjson.JSONDecodeError:
+        # Corps non-JSON (page d'erreur, challenge): rien à récupérer
+        return None
+    except Exception as e:
+        logger.warning("Error fetching JSON %s: %s", url, e)
+        return None
+
+# Résolution DNS asynchrone (dépendance optionnelle)
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+# Session aiohttp partagée par tous les scrapers, ouverte au démarrage de l'API
+# (voir open_shared_session), ou à la première requête hors de l'API
+_shared_session: Optional[aiohttp.ClientSession] = None
+# Boucle d'événements de la session: une session ne survit pas à sa boucle
+# (scripts qui enchaînent plusieurs asyncio.run)
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _async_resolver() -> Optional[aiohttp.abc.AbstractResolver]:
+    """
+    Résolveur DNS asynchrone (aiodns/c-ares) si disponible, sinon None
+    
+    aiohttp 3.9 ne l'active jamais de lui-même: sans lui, chaque résolution
+    non cachée passe par getaddrinfo dans le pool de threads par défaut.
+    """
+    if aiodns is None:
+        return None
+    try:
+        # Le canal c-ares est lié à la boucle en cours
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return aiohttp.AsyncResolver()
+
+def open_shared_session(max_connections: int = 100, max_connections_per_host: int = 64,
+                        keepalive_timeout: float = 30, dns_cache_ttl: int = 300,
+                        connect_timeout: float = 10, read_timeout: float = 30,
+                        read_bufsize: int = 2 ** 16, force_ipv4: bool = False) -> aiohttp.ClientSession:
+    """Ouvre la session HTTP partagée (pool de connexions keep-alive)"""
+    global _shared_session, _shared_session_loop
+    connector = aiohttp.TCPConnector(
+        limit=max_connections,
+        limit_per_host=max_connections_per_host,
+        keepalive_timeout=keepalive_timeout,
+        use_dns_cache=True,
+        ttl_dns_cache=dns_cache_ttl,
+        resolver=_async_resolver(),
+        # IPv4 seul: pas d'attente sur une route IPv6 défaillante (aiohttp
+        # 3.9 essaie les adresses l'une après l'autre, sans happy eyeballs)
+        family=socket.AF_INET if force_ipv4 else 0,
+    )
+    _shared_session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout),
+        # Un tampon plus grand évite les pauses/reprises de lecture du socket
+        # sur les pages HTML volumineuses
+        read_bufsize=read_bufsize,
+    )
+    try:
+        _shared_session_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _shared_session_loop = None
+    return _shared_session
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Retourne la session partagée, ouverte avec les réglages par défaut si besoin"""
+    if (_shared_session is None or _shared_session.closed
+            or (_shared_session_loop is not None and _shared_session_loop.is_closed())):
+        return open_shared_session()
+    return _shared_session
+
+async def close_shared_session():
+    """Ferme la session HTTP partagée (arrêt de l'API, ou fin d'un script qui scrape directement)"""
+    global _shared_session
+    if _shared_session is not None:
+        await _shared_session.close()
+        _shared_session = None
+
+# Taille des morceaux lus du socket et passés au parser HTML incrémental
+_STREAM_CHUNK_SIZE = 2 ** 16
+
+async def _parse_stream(content: aiohttp.StreamReader):
+    """
+    Construit l'arbre lxml au fil des morceaux reçus
+    
+    Le parsing avance pendant que le reste de la page arrive, et le corps
+    complet n'est jamais gardé en mémoire sous forme de bytes.
+    """
+    # Un parser par réponse: feed() garde un état propre au document
+    parser = lxml_html.HTMLParser(encoding='utf-8')
+    fed = False
+    async for chunk in content.iter_chunked(_STREAM_CHUNK_SIZE):
+        parser.feed(chunk)
+        fed = True
+    # Corps vide: None, comme une page non récupérée (l'appelant peut réessayer)
+    return parser.close() if fed else None
+
+async def _fetch(url: str, headers: Dict[str, str], timeout: int, as_json: bool = False,
+                 raw: bool = False, tree: bool = False,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 raise_for_status: bool = False) -> Optional[Any]:
+    """
+    GET via la session fournie, sinon via la session partagée (ouverte au
+    premier appel): les connexions TCP/TLS sont réutilisées d'une requête à l'autre
+    
+    Avec raise_for_status, une réponse 4xx/5xx lève ClientResponseError au lieu
+    de renvoyer None: retry_request voit alors le statut (et le Retry-After).
+    """
+    if session is None or session.closed:
+        session = get_shared_session()
+    # aiohttp remplace le timeout de la session par celui de la requête (sans
+    # fusion): on reprend ses délais de connexion et de lecture, seul le total
+    # est propre à l'appel
+    base = session.timeout
+    request_timeout = aiohttp.ClientTimeout(total=timeout, connect=base.connect,
+                                            sock_connect=base.sock_connect, sock_read=base.sock_read)
+    async with session.get(url, headers=headers, timeout=request_timeout) as response:
+        if response.status == 200:
+            # orjson sur les octets bruts: plus rapide que response.json(),
+            # et indépendant du Content-Type annoncé
+            if as_json:
+                return orjson.loads(await response.read())
+            if tree:
+                return await _parse_stream(response.content)
+            return await response.read() if raw else await response.text()
+        if raise_for_status:
+            response.raise_for_status()
+        return None
+
+async def fetch_page(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                     session: Optional[aiohttp.ClientSession] = None,
+                     raise_errors: bool = False) -> Optional[str]:
+    """
+    Récupère le contenu d'une page (async avec aiohttp)
+    
+    Pas de repli sur requests: refaire la même requête en synchrone bloquerait
+    la boucle d'événements (jusqu'au timeout) pour un résultat rarement meilleur.
+    Les réessais se font côté async (retry_request, AsyncRequestPool): avec
+    raise_errors, les erreurs réseau et HTTP (4xx/5xx) remontent à l'appelant.
+    """
+    if headers is None:
+        headers = get_random_headers()
+    
+    try:
+        return await _fetch(url, headers, timeout, session=session, raise_for_status=raise_errors)
+    except Exception as e:
+        if raise_errors:
+            raise
+        logger.warning("Error fetching %s: %s", url, e)
         return None
+
+async def fetch_page_bytes(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                           session: Optional[aiohttp.ClientSession] = None) -> Optional[bytes]:
+    """
+    Récupère une page sous forme d'octets bruts, à passer tel quel à parse_html
+    
+    Évite le décodage en str côté Python et la copie qui va avec.
+    """
+    if headers is None:
+        headers = get_random_headers()
+    
+    try:
+        return await _fetch(url, headers, timeout, raw=True, session=session)
     except Exception as e:
-        print(f"Error fetching JSON {url}: {e}")
+        logger.warning("Error fetching %s: %s", url, e)
         return None
 
-async def fetch_page(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[str]:
-    """Récupère le contenu d'une page (async avec aiohttp, fallback sur requests)"""
+async def fetch_tree(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                     session: Optional[aiohttp.ClientSession] = None):
+    """Récupère une page déjà parsée en arbre lxml (parsing en flux pendant la réception)"""
     if headers is None:
         headers = get_random_headers()
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-                if response.status == 200:
-                    return await response.text()
-                return None
+        return await _fetch(url, headers, timeout, tree=True, session=session)
     except Exception as e:
-        # Fallback sur requests synchrone
-        return fetch_page_sync(url, headers, timeout)
+        logger.warning("Error fetching %s: %s", url, e)
+        return None
 
-async def fetch_json(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30) -> Optional[Dict]:
-    """Récupère du JSON depuis une URL (async avec aiohttp, fallback sur requests)"""
+async def fetch_json(url: str, headers: Optional[Dict[str, str]] = None, timeout: int = 30,
+                     session: Optional[aiohttp.ClientSession] = None,
+                     raise_errors: bool = False) -> Optional[Dict]:
+    """
+    Récupère du JSON depuis une URL (async avec aiohttp, sans repli synchrone)
+    
+    raise_errors: comme pour fetch_page, les erreurs réseau et HTTP remontent.
+    """
     if headers is None:
         headers = get_random_headers()
         headers["Accept"] = "application/json"
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        return await _fetch(url, headers, timeout, as_json=True, session=session,
+                            raise_for_status=raise_errors)
+    except orjson.JSONDecodeError:
+        # La réponse est arrivée mais n'est pas du JSON
+        return None
     except Exception as e:
-        # Fallback sur requests synchrone
-        return fetch_json_sync(url, headers, timeout)
+        if raise_errors:
+            raise
+        logger.warning("Error fetching JSON %s: %s", url, e)
+        return None
+
+# Les sites scrapés servent de l'UTF-8; sans encodage explicite, libxml2
+# retomberait sur latin-1 pour les pages sans <meta charset>
+_UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+def parse_html(html: Union[str, bytes]):
+    """Parse une page directement avec lxml.html (sans la couche BeautifulSoup)"""
+    if not html or not html.strip():
+        # Fragment ajax vide: lxml refuse un document vide, BeautifulSoup non
+        return lxml_html.document_fromstring('<html></html>')
+    if isinstance(html, bytes):
+        return lxml_html.document_fromstring(html, parser=_UTF8_HTML_PARSER)
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # Chaîne avec une déclaration d'encodage: lxml exige des bytes
+        return lxml_html.document_fromstring(html.encode('utf-8'))
+
+def has_class(name: str) -> str:
+    """Prédicat XPath équivalent au filtre class_=name de BeautifulSoup"""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+_TEXT_NODES_XPATH = etree.XPath('.//text()')
+
+def node_text(elem) -> str:
+    """Texte d'un nœud lxml, comme get_text(strip=True) de BeautifulSoup"""
+    return ''.join(text.strip() for text in _TEXT_NODES_XPATH(elem))
+
+def first_node(xpath, elem):
+    """Premier nœud trouvé par un XPath compilé, ou None"""
+    nodes = xpath(elem)
+    return nodes[0] if nodes else None
+
+def id_from_href(href: str) -> str:
+    """Dernier segment d'un lien, sans query string: sert d'identifiant de contenu"""
+    return href.rpartition('/')[2].partition('?')[0]
 
 def bypass_cloudflare(url: str, headers: Optional[Dict[str, str]] = None) -> Optional[str]:
     """Contourne la protection Cloudflare avec cloudscraper"""
     try:
+        # Import coûteux, seulement utile quand une page est protégée
+        import cloudscraper
+        
         scraper = cloudscraper.create_scraper()
         response = scraper.get(url, headers=headers or get_random_headers(), timeout=30)
         if response.status_code == 200:
             return response.text
         return None
     except Exception as e:
-        print(f"Cloudflare bypass error: {e}")
+        logger.warning("Cloudflare bypass error for %s: %s", url, e)
         return None
 
+# cloudscraper est bloquant (et coûteux en CPU pour le défi JS): on l'exécute
+# dans un pool de threads borné plutôt que sur la boucle d'événements
+_bypass_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cloudflare")
+
+async def bypass_cloudflare_async(url: str, headers: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """bypass_cloudflare sans bloquer la boucle d'événements"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bypass_executor, bypass_cloudflare, url, headers)
+
+# Durée de cache des résultats qui embarquent des liens de streaming (jetons
+# d'accès, liens ajax): au-delà de quelques minutes, ces liens expirent
+SOURCE_LINKS_TTL = 300
+
+def async_ttl_cache(maxsize: int = 512, ttl: float = 3600):
+    """
+    Décorateur: cache TTL borné pour une méthode async de scraper
+    
+    La clé est (classe du scraper, arguments). Seuls les résultats non vides
+    sont gardés, pour qu'un échec temporaire soit réessayé au prochain appel.
+    """
+    def decorator(method):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            key = (type(self), args, tuple(sorted(kwargs.items())))
+            result = cache.get(key)
+            if result is None:
+                result = await method(self, *args, **kwargs)
+                if result:
+                    cache[key] = result
+            return result
+        
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+# Attente maximale entre deux tentatives, Retry-After compris
+_RETRY_MAX_DELAY = 30.0
+
+def _retry_delay(error: Optional[Exception], attempt: int, delay: float) -> Optional[float]:
+    """
+    Attente avant la tentative suivante, None s'il est inutile de réessayer
+    
+    Backoff exponentiel avec jitter complet; une erreur HTTP 4xx (hors 408/429)
+    arrête les tentatives, et un Retry-After annoncé par le serveur est respecté.
+    """
+    status, retry_after = None, None
+    if isinstance(error, aiohttp.ClientResponseError):
+        status = error.status
+        retry_after = (error.headers or {}).get('Retry-After')
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        retry_after = error.response.headers.get('Retry-After')
+    if status is not None and 400 <= status < 500 and status not in (408, 429):
+        return None
+    if retry_after:
+        try:
+            return min(_RETRY_MAX_DELAY, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(_RETRY_MAX_DELAY, delay * 2 ** attempt))
+
 def retry_request(func, max_retries: int = 3, delay: float = 1.0):
-    """Décorateur pour réessayer une requête"""
+    """
+    Décorateur pour réessayer une requête (fonction synchrone ou coroutine)
+    
+    Une coroutine attend avec asyncio.sleep, sans bloquer la boucle d'événements.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            for attempt in range(max_retries):
+                error = None
+                try:
+                    result = await func(*args, **kwargs)
+                    if result:
+                        return result
+                except Exception as e:
+                    error = e
+                    logger.warning("Attempt %d failed: %s", attempt + 1, e)
+                wait = _retry_delay(error, attempt, delay)
+                if wait is None:
+                    break
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(wait)
+            return None
+        return async_wrapper
+    
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         for attempt in range(max_retries):
+            error = None
             try:
                 result = func(*args, **kwargs)
                 if result:
                     return result
             except Exception as e:
-                print(f"Attempt {attempt + 1} failed: {e}")
+                error = e
+                logger.warning("Attempt %d failed: %s", attempt + 1, e)
+            wait = _retry_delay(error, attempt, delay)
+            if wait is None:
+                break
             if attempt < max_retries - 1:
-                import time
-                time.sleep(delay * (attempt + 1))
+                time.sleep(wait)
         return None
     return wrapper
 
+# Motifs des helpers d'extraction, compilés une seule fois à l'import
+# (le cache interne de re est borné et partagé avec le reste du process)
+# (hébergeur, littéral exigé par le motif, motif): le test "littéral in url"
+# (recherche de sous-chaîne en C) écarte les hébergeurs sans lancer leur regex
+_VIDEO_HOST_PATTERNS = tuple((host, literal, re.compile(pattern)) for host, literal, pattern in (
+    ('streamtape', 'streamtape.com/e/', r'streamtape\.com/e/(\w+)'),
+    ('doodstream', 'dood.', r'dood\.[^/]+/e/(\w+)'),
+    ('mixdrop', 'mixdrop.', r'mixdrop\.[^/]+/e/(\w+)'),
+    ('upstream', 'upstream.to/e/', r'upstream\.to/e/(\w+)'),
+    ('vidcloud', 'vidcloud.', r'vidcloud\.[^/]+/e/(\w+)'),
+    ('mp4upload', 'mp4upload.com/embed-', r'mp4upload\.com/embed-(\w+)'),
+    ('yourupload', 'yourupload.com/embed/', r'yourupload\.com/embed/(\w+)'),
+    ('sbembed', 'sbembed.com/embed/', r'sbembed\.com/embed/(\w+)'),
+    ('filemoon', 'filemoon.sx/e/', r'filemoon\.sx/e/(\w+)'),
+    ('voe', 'voe.sx/e/', r'voe\.sx/e/(\w+)'),
+))
+_M3U8_PATTERN_SOURCES = (
+    r'["\'](https?://[^"\']+\.m3u8[^"\']*)["\']',
+    r'file["\']?\s*:\s*["\']([^"\']+\.m3u8[^"\']*)["\']',
+    r'sources?["\']?\s*:\s*\[.*?["\']([^"\']+\.m3u8[^"\']*)["\']',
+)
+# Les trois motifs m3u8 exigent ce littéral: un seul balayage sans
+# backtracking suffit à écarter les pages qui n'en contiennent pas
+_M3U8_MARKER_SOURCE = r'\.m3u8'
+# URLs absolues entre guillemets, m3u8 ou mp4: le premier motif m3u8 et le
+# motif mp4 ont la même forme, parse_embed_page les fusionne en un seul balayage
+_MEDIA_URL_SOURCE = r'["\'](https?://[^"\']+\.(?:m3u8|mp4)[^"\']*)["\']'
+# Littéral exigé par tous les motifs d'embed: une page qui ne le contient pas
+# ne coûte qu'une recherche de littéral, sans lancer les motifs complets
+_MEDIA_MARKER_SOURCE = r'\.m(?:3u8|p4)'
+
+def _compile_embed_patterns(as_bytes: bool):
+    """(marqueur média, motif média, marqueur m3u8, motifs m3u8), compilés en str ou en bytes"""
+    encode = (lambda pattern: pattern.encode('ascii')) if as_bytes else (lambda pattern: pattern)
+    return (
+        re.compile(encode(_MEDIA_MARKER_SOURCE), re.IGNORECASE),
+        re.compile(encode(_MEDIA_URL_SOURCE), re.IGNORECASE),
+        re.compile(encode(_M3U8_MARKER_SOURCE), re.IGNORECASE),
+        tuple(re.compile(encode(pattern), re.IGNORECASE | re.DOTALL) for pattern in _M3U8_PATTERN_SOURCES),
+    )
+
+# Les URLs cherchées sont ASCII: sur les octets bruts d'une page (fetch_page_bytes),
+# les motifs bytes évitent de décoder tout le HTML pour n'en garder que quelques URLs
+_STR_EMBED_PATTERNS = _compile_embed_patterns(False)
+_BYTES_EMBED_PATTERNS = _compile_embed_patterns(True)
+
+def _embed_patterns(html: Union[str, bytes]):
+    """Jeu de motifs adapté au type du HTML"""
+    if isinstance(html, (bytes, bytearray)):
+        return _BYTES_EMBED_PATTERNS
+    return _STR_EMBED_PATTERNS
+
+def _as_text(url: Union[str, bytes]) -> str:
+    """Décode une URL trouvée par un motif bytes (seuls ces quelques octets sont décodés)"""
+    return url.decode('utf-8', 'replace') if isinstance(url, bytes) else url
+
+_POSTER_CLASS_RE = re.compile('poster', re.I)
+_DESCRIPTION_CLASSES = ('description', 'synopsis', 'summary', 'plot')
+_DESCRIPTION_CLASS_RES = tuple(re.compile(class_name, re.I) for class_name in _DESCRIPTION_CLASSES)
+_DESCRIPTION_CLASS_RE = re.compile('|'.join(_DESCRIPTION_CLASSES), re.I)
+_WHITESPACE_RE = re.compile(r'\s+')
+_QUERY_JUNK_RE = re.compile(r'[^\w\s\-+]')
+
+@functools.lru_cache(maxsize=2048)
+def _match_video_host(embed_url: str) -> Optional[tuple]:
+    """(hébergeur, id vidéo) d'un embed, mis en cache: les mêmes embeds reviennent souvent"""
+    for host, literal, pattern in _VIDEO_HOST_PATTERNS:
+        if literal in embed_url:
+            match = pattern.search(embed_url)
+            if match:
+                return host, match.group(1)
+    return None
+
 def extract_video_url(embed_url: str) -> Optional[Dict[str, Any]]:
     """Extrait l'URL vidéo depuis un embed"""
-    patterns = {
-        'streamtape': r'streamtape\.com/e/(\w+)',
-        'doodstream': r'dood\.[^/]+/e/(\w+)',
-        'mixdrop': r'mixdrop\.[^/]+/e/(\w+)',
-        'upstream': r'upstream\.to/e/(\w+)',
-        'vidcloud': r'vidcloud\.[^/]+/e/(\w+)',
-        'mp4upload': r'mp4upload\.com/embed-(\w+)',
-        'yourupload': r'yourupload\.com/embed/(\w+)',
-        'sbembed': r'sbembed\.com/embed/(\w+)',
-        'filemoon': r'filemoon\.sx/e/(\w+)',
-        'voe': r'voe\.sx/e/(\w+)',
-    }
-    
-    for host, pattern in patterns.items():
-        match = re.search(pattern, embed_url)
-        if match:
-            return {
-                'host': host,
-                'video_id': match.group(1),
-                'embed_url': embed_url,
-                'direct_url': None  # Nécessite extraction supplémentaire
-            }
+    match = _match_video_host(embed_url)
+    if match:
+        # Dict neuf à chaque appel: l'appelant complète direct_url
+        host, video_id = match
+        return {
+            'host': host,
+            'video_id': video_id,
+            'embed_url': embed_url,
+            'direct_url': None  # Nécessite extraction supplémentaire
+        }
     return None
 
+# Alphabet base64 "URL-safe" (-_) ramené à l'alphabet standard (+/)
+_URLSAFE_B64_TABLE = bytes.maketrans(b'-_', b'+/')
+
 def decode_base64_url(encoded: str) -> str:
-    """Décode une URL encodée en base64"""
+    """Décode une URL encodée en base64 (alphabet standard ou URL-safe, padding facultatif)"""
     try:
-        padding = 4 - len(encoded) % 4
-        if padding != 4:
-            encoded += '=' * padding
-        return base64.b64decode(encoded).decode('utf-8')
-    except:
+        data = encoded.encode('ascii').translate(_URLSAFE_B64_TABLE)
+        # -len & 3: nombre de "=" manquants pour atteindre un multiple de 4
+        return binascii.a2b_base64(data + b'=' * (-len(data) & 3)).decode('utf-8')
+    except Exception:
         return ""
 
-def extract_m3u8_from_script(html: str) -> List[str]:
-    """Extrait les URLs m3u8 du JavaScript"""
-    patterns = [
-        r'["\'](https?://[^"\']+\.m3u8[^"\']*)["\']',
-        r'file["\']?\s*:\s*["\']([^"\']+\.m3u8[^"\']*)["\']',
-        r'sources?["\']?\s*:\s*\[.*?["\']([^"\']+\.m3u8[^"\']*)["\']',
-    ]
+def extract_m3u8_from_script(html: Union[str, bytes]) -> List[str]:
+    """Extrait les URLs m3u8 du JavaScript (str, ou octets bruts de la page)"""
+    _, _, marker, patterns = _embed_patterns(html)
+    if not marker.search(html):
+        return []
     
-    urls = []
+    urls = set()
     for pattern in patterns:
-        matches = re.findall(pattern, html, re.IGNORECASE | re.DOTALL)
-        urls.extend(matches)
+        urls.update(pattern.findall(html))
     
-    return list(set(urls))
+    return [_as_text(url) for url in urls]
 
-def decrypt_aes(encrypted: str, key: str, iv: str) -> str:
-    """Déchiffre du texte AES (pour certains sites)"""
+# Backend AES-CBC choisi une seule fois à l'import (dépendances optionnelles):
+# cryptography (OpenSSL EVP, AES-NI) de préférence, sinon pycryptodome
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    from cryptography.hazmat.primitives.padding import PKCS7
+    
+    def _aes_cbc_decrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
+        decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+        unpadder = PKCS7(128).unpadder()
+        padded = decryptor.update(data) + decryptor.finalize()
+        return unpadder.update(padded) + unpadder.finalize()
+except ImportError:
     try:
         from Crypto.Cipher import AES
         from Crypto.Util.Padding import unpad
         
+        def _aes_cbc_decrypt(data: bytes, key: bytes, iv: bytes) -> bytes:
+            return unpad(AES.new(key, AES.MODE_CBC, iv).decrypt(data), AES.block_size)
+    except ImportError:
+        _aes_cbc_decrypt = None
+
+def decrypt_aes(encrypted: str, key: str, iv: str) -> str:
+    """Déchiffre du texte AES (pour certains sites)"""
+    if not encrypted:
+        return ""
+    if _aes_cbc_decrypt is None:
+        logger.error("AES decryption error: install cryptography or pycryptodome")
+        return ""
+    try:
         key_bytes = key.encode('utf-8')
         iv_bytes = iv.encode('utf-8')
         encrypted_bytes = base64.b64decode(encrypted)
+        # AES-CBC ne produit que des blocs entiers de 16 octets: inutile de
+        # monter le déchiffrement pour un candidat qui n'en est pas un
+        if not encrypted_bytes or len(encrypted_bytes) % 16:
+            return ""
         
-        cipher = AES.new(key_bytes, AES.MODE_CBC, iv_bytes)
-        decrypted = unpad(cipher.decrypt(encrypted_bytes), AES.block_size)
-        return decrypted.decode('utf-8')
+        return _aes_cbc_decrypt(encrypted_bytes, key_bytes, iv_bytes).decode('utf-8')
     except Exception as e:
-        print(f"AES decryption error: {e}")
+        logger.warning("AES decryption error: %s", e)
         return ""
 
-def parse_embed_page(html: str, referer: str = "") -> List[Dict[str, Any]]:
-    """Parse une page d'embed et extrait les sources vidéo"""
-    sources = []
-    
-    # Chercher les sources m3u8
-    m3u8_urls = extract_m3u8_from_script(html)
-    for url in m3u8_urls:
-        sources.append({
-            'url': url,
-            'type': 'hls',
-            'quality': 'auto',
-            'is_m3u8': True
-        })
-    
-    # Chercher les sources mp4
-    mp4_pattern = r'["\'](https?://[^"\']+\.mp4[^"\']*)["\']'
-    mp4_urls = re.findall(mp4_pattern, html, re.IGNORECASE)
-    for url in mp4_urls:
-        sources.append({
-            'url': url,
-            'type': 'mp4',
-            'quality': 'unknown',
-            'is_m3u8': False
-        })
+def parse_embed_page(html: Union[str, bytes], referer: str = "") -> List[Dict[str, Any]]:
+    """Parse une page d'embed (str, ou octets bruts) et extrait les sources vidéo"""
+    media_marker, media, marker, patterns = _embed_patterns(html)
+    found = media_marker.search(html)
+    if not found:
+        return []
+    
+    # Un seul balayage pour les URLs absolues m3u8 et mp4; une URL est rangée
+    # selon l'extension qu'elle contient (dict: dédoublonné, ordre conservé)
+    m3u8_urls = {}
+    mp4_urls = {}
+    for url in map(_as_text, media.findall(html)):
+        lowered = url.lower()
+        if '.m3u8' in lowered:
+            m3u8_urls[url] = None
+        if '.mp4' in lowered:
+            mp4_urls[url] = None
+    
+    # Les autres motifs m3u8 (file: / sources: [...], URLs relatives comprises)
+    # ne servent que si la page contient le littéral, forcément après le
+    # premier littéral média trouvé
+    if m3u8_urls or marker.search(html, found.start()):
+        for pattern in patterns[1:]:
+            m3u8_urls.update(dict.fromkeys(map(_as_text, pattern.findall(html))))
+    
+    sources = [{
+        'url': url,
+        'type': 'hls',
+        'quality': 'auto',
+        'is_m3u8': True
+    } for url in m3u8_urls]
+    sources.extend({
+        'url': url,
+        'type': 'mp4',
+        'quality': 'unknown',
+        'is_m3u8': False
+    } for url in mp4_urls)
     
     return sources
 
+def _first_meta_contents(soup: BeautifulSoup, keys) -> Dict[str, str]:
+    """
+    Contenu de la première balise meta de chaque clé (property ou name),
+    en un seul parcours des balises meta
+    """
+    found = {}
+    for meta in soup.find_all('meta'):
+        for attr in ('property', 'name'):
+            key = meta.get(attr)
+            if key in keys and (attr, key) not in found:
+                found[(attr, key)] = meta.get('content', '')
+    return found
+
+_POSTER_META_KEYS = frozenset({'og:image', 'twitter:image'})
+_DESCRIPTION_META_KEYS = frozenset({'description', 'og:description'})
+
 def extract_poster_url(soup: BeautifulSoup, base_url: str = "") -> str:
     """Extrait l'URL du poster"""
-    # Meta og:image
-    meta = soup.find('meta', property='og:image')
-    if meta:
-        return meta.get('content', '')
-    
-    # Meta twitter:image
-    meta = soup.find('meta', property='twitter:image')
-    if meta:
-        return meta.get('content', '')
+    # Meta og:image, puis twitter:image
+    metas = _first_meta_contents(soup, _POSTER_META_KEYS)
+    for key in (('property', 'og:image'), ('property', 'twitter:image')):
+        if key in metas:
+            return metas[key]
     
     # Image avec classe poster
-    img = soup.find('img', class_=re.compile('poster', re.I))
+    img = soup.find('img', class_=_POSTER_CLASS_RE)
     if img:
         return urljoin(base_url, img.get('src', ''))
     
@@ -231,39 +690,88 @@ def extract_poster_url(soup: BeautifulSoup, base_url: str = "") -> str:
 
 def extract_description(soup: BeautifulSoup) -> str:
     """Extrait la description"""
-    # Meta description
-    meta = soup.find('meta', attrs={'name': 'description'})
-    if meta:
-        return meta.get('content', '')
+    # Meta description, puis og:description
+    metas = _first_meta_contents(soup, _DESCRIPTION_META_KEYS)
+    for key in (('name', 'description'), ('property', 'og:description')):
+        if key in metas:
+            return metas[key]
     
-    meta = soup.find('meta', property='og:description')
-    if meta:
-        return meta.get('content', '')
-    
-    # Div avec classe description/synopsis
-    for class_name in ['description', 'synopsis', 'summary', 'plot']:
-        div = soup.find(['div', 'p'], class_=re.compile(class_name, re.I))
-        if div:
-            return div.get_text(strip=True)
+    # Div avec classe description/synopsis: un seul parcours, la classe la
+    # plus prioritaire l'emporte quelle que soit sa position dans la page
+    best, best_rank = None, len(_DESCRIPTION_CLASS_RES)
+    for elem in soup.find_all(['div', 'p'], class_=_DESCRIPTION_CLASS_RE):
+        classes = ' '.join(elem.get('class', ()))
+        rank = next(i for i, class_re in enumerate(_DESCRIPTION_CLASS_RES) if class_re.search(classes))
+        if rank < best_rank:
+            best, best_rank = elem, rank
+            if rank == 0:
+                break
+    if best is not None:
+        return best.get_text(strip=True)
     
     return ""
 
+# Variantes lxml des deux helpers ci-dessus, pour les appelants qui ont le
+# HTML brut: mêmes priorités, XPath compilés exécutés en C
+def _class_contains_xpath(tags: str, class_name: str) -> etree.XPath:
+    """Premier élément `tags` dont l'attribut class contient class_name (sans casse)"""
+    return etree.XPath(
+        f'(//*[{tags}][contains(translate(@class, "{class_name.upper()}", "{class_name}"), "{class_name}")])[1]'
+    )
+
+_POSTER_META_XPATHS = tuple(
+    etree.XPath(f'(//meta[@property="{prop}"])[1]') for prop in ('og:image', 'twitter:image')
+)
+_POSTER_IMG_XPATH = _class_contains_xpath('self::img', 'poster')
+_DESCRIPTION_META_XPATHS = (
+    etree.XPath('(//meta[@name="description"])[1]'),
+    etree.XPath('(//meta[@property="og:description"])[1]'),
+)
+_DESCRIPTION_BLOCK_XPATHS = tuple(
+    _class_contains_xpath('self::div or self::p', class_name) for class_name in _DESCRIPTION_CLASSES
+)
+
+def extract_poster_url_from_html(html: Union[str, bytes], base_url: str = "") -> str:
+    """extract_poster_url sur du HTML brut, parsé avec lxml plutôt que BeautifulSoup"""
+    tree = parse_html(html)
+    for xpath in _POSTER_META_XPATHS:
+        meta = xpath(tree)
+        if meta:
+            return meta[0].get('content', '')
+    img = _POSTER_IMG_XPATH(tree)
+    if img:
+        return urljoin(base_url, img[0].get('src', ''))
+    return ""
+
+def extract_description_from_html(html: Union[str, bytes]) -> str:
+    """extract_description sur du HTML brut, parsé avec lxml plutôt que BeautifulSoup"""
+    tree = parse_html(html)
+    for xpath in _DESCRIPTION_META_XPATHS:
+        meta = xpath(tree)
+        if meta:
+            return meta[0].get('content', '')
+    for xpath in _DESCRIPTION_BLOCK_XPATHS:
+        block = xpath(tree)
+        if block:
+            return node_text(block[0])
+    return ""
+
+@functools.lru_cache(maxsize=4096)
 def clean_title(title: str) -> str:
-    """Nettoie un titre"""
+    """Nettoie un titre (mis en cache: les mêmes titres reviennent d'une page à l'autre)"""
     if not title:
         return ""
-    # Enlever les espaces multiples
-    title = re.sub(r'\s+', ' ', title)
-    # Enlever les caractères spéciaux au début/fin
-    title = title.strip(' -:|•')
-    return title.strip()
+    # Espaces multiples ramenés à un seul espace, puis caractères spéciaux
+    # enlevés au début/fin: après la substitution, le seul blanc restant est
+    # ' ', déjà dans le jeu du strip
+    return _WHITESPACE_RE.sub(' ', title).strip(' -:|•')
 
 def normalize_search_query(query: str) -> str:
     """Normalise une requête de recherche"""
     # Remplacer les espaces par des +
-    query = re.sub(r'\s+', '+', query.strip())
+    query = _WHITESPACE_RE.sub('+', query.strip())
     # Enlever les caractères spéciaux
-    query = re.sub(r'[^\w\s\-+]', '', query)
+    query = _QUERY_JUNK_RE.sub('', query)
     return query.lower()
 
 class AsyncRequestPool:
@@ -273,10 +781,53 @@ class AsyncRequestPool:
         self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
     
+    # Réessais avec backoff (retry_request): l'attente se fait hors du
+    # sémaphore, une requête en échec ne bloque pas de place pendant ce temps.
+    # Les erreurs remontent (raise_errors) pour que retry_request abandonne
+    # sur un 4xx définitif et respecte le Retry-After d'un 429/503.
+    @retry_request
     async def fetch(self, url: str, headers: Optional[Dict] = None) -> Optional[str]:
         async with self.semaphore:
-            return await fetch_page(url, headers)
+            return await fetch_page(url, headers, raise_errors=True)
+    
+    async def _map_urls(self, fetch, urls: List[str], headers: Optional[Dict],
+                        swallow_errors: bool = False) -> Dict[str, Any]:
+        """
+        Applique `fetch` à chaque URL distincte avec au plus max_concurrent workers
+        
+        Les workers se partagent un itérateur sur les URLs: seules max_concurrent
+        coroutines existent à la fois, quelle que soit la longueur de la liste.
+        """
+        pending = iter(dict.fromkeys(urls))
+        results: Dict[str, Any] = {}
+        
+        async def worker():
+            for url in pending:
+                try:
+                    results[url] = await fetch(url, headers)
+                except Exception:
+                    if not swallow_errors:
+                        raise
+                    results[url] = None
+        
+        await asyncio.gather(*(worker() for _ in range(max(1, min(self.max_concurrent, len(urls))))))
+        return results
     
     async def fetch_multiple(self, urls: List[str], headers: Optional[Dict] = None) -> List[Optional[str]]:
-        tasks = [self.fetch(url, headers) for url in urls]
-        return await asyncio.gather(*tasks)
+        """Récupère plusieurs pages en parallèle, une seule requête par URL distincte"""
+        pages = await self._map_urls(self.fetch, urls, headers)
+        return [pages[url] for url in urls]
+    
+    @retry_request
+    async def fetch_json(self, url: str, headers: Optional[Dict] = None) -> Optional[Dict]:
+        async with self.semaphore:
+            return await fetch_json(url, headers, raise_errors=True)
+    
+    async def fetch_json_multiple(self, urls: List[str], headers: Optional[Dict] = None) -> List[Optional[Dict]]:
+        """
+        Récupère plusieurs URLs JSON en parallèle, dans l'ordre des URLs (None en cas d'échec)
+        
+        Une seule requête par URL distincte: les doublons reçoivent le même résultat.
+        """
+        by_url = await self._map_urls(self.fetch_json, urls, headers, swallow_errors=True)
+        return [by_url[url] for url in urls]